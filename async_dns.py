@@ -0,0 +1,33 @@
+import asyncio
+import dns.asyncresolver
+import dns.resolver
+
+class AsyncDNSResolver:
+    """Non-blocking DNS resolver with configurable nameservers and a TTL-aware answer cache"""
+
+    def __init__(self, nameservers=None, port: int = 53, timeout: float = 3.0,
+                 lifetime: float = 8.0, cache_size: int = 10000):
+        # Only read the system configuration when no nameservers are given
+        self.resolver = dns.asyncresolver.Resolver(configure=not nameservers)
+        if nameservers:
+            self.resolver.nameservers = list(nameservers)
+        self.resolver.port = port
+        self.resolver.timeout = timeout
+        self.resolver.lifetime = lifetime
+        # LRUCache expires each answer when its record TTL runs out
+        self.resolver.cache = dns.resolver.LRUCache(cache_size)
+
+    async def resolve(self, name: str, rdtype: str):
+        return await self.resolver.resolve(name, rdtype)
+
+    async def resolve_mx_and_a(self, domain: str):
+        """Query MX and A records in parallel.
+
+        Returns a (mx_result, a_result) tuple where each item is either the
+        answer or the exception raised while resolving it.
+        """
+        return await asyncio.gather(
+            self.resolve(domain, 'MX'),
+            self.resolve(domain, 'A'),
+            return_exceptions=True
+        )
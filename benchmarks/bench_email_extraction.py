@@ -0,0 +1,67 @@
+"""Compare the shared email extractor against the old per-scraper regex loop.
+
+Run from the repository root:
+
+    python benchmarks/bench_email_extraction.py
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from email_extractor import EMAIL_REGEX, extract_emails
+
+def legacy_extract(content):
+    """The extraction loop previously duplicated in every scraper"""
+    emails = set()
+    for email in re.findall(EMAIL_REGEX, content):
+        email = email.lower()
+        if not email.endswith(('.png', '.jpg', '.jpeg', '.svg', '.gif', '.webp')):
+            emails.add(email)
+    return emails
+
+def make_page(size_bytes, emails_per_page=20, seed=0):
+    """Build a synthetic business home page of roughly size_bytes"""
+    rng = random.Random(seed)
+    blocks = [
+        '<div class="col-md-4"><p>Lorem ipsum dolor sit amet, consectetur adipiscing elit.</p></div>\n',
+        '<script>window.__DATA__={"id":%d,"name":"widget","enabled":true};</script>\n',
+        '<a href="https://example.org/listing/%d?ref=home">Listing</a>\n',
+        '<img src="/static/img/logo@2x.png" srcset="/static/img/logo@3x.png 3x">\n',
+        '<style>.btn-%d{color:#333;padding:4px 8px;margin:0}</style>\n',
+    ]
+    parts = []
+    total = 0
+    while total < size_bytes:
+        block = rng.choice(blocks)
+        if '%d' in block:
+            block = block % rng.randint(0, 10 ** 6)
+        parts.append(block)
+        total += len(block)
+    for i in range(emails_per_page):
+        parts.insert(rng.randrange(len(parts)), f'<a href="mailto:Contact{i}@Business{i}.ae">Email us</a>\n')
+    return ''.join(parts)
+
+def bench(func, pages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            func(page)
+    elapsed = time.perf_counter() - start
+    return len(pages) * repeat / elapsed
+
+def main():
+    for size in (100_000, 1_000_000, 5_000_000):
+        pages = [make_page(size, seed=seed) for seed in range(5)]
+        repeat = max(1, 20_000_000 // (size * len(pages)))
+        assert all(legacy_extract(page) == extract_emails(page) for page in pages)
+        legacy_rate = bench(legacy_extract, pages, repeat)
+        shared_rate = bench(extract_emails, pages, repeat)
+        print(f"{size / 1_000_000:>4.1f} MB pages: legacy {legacy_rate:8.1f} pages/s, "
+              f"shared {shared_rate:8.1f} pages/s ({shared_rate / legacy_rate:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Compare the frontier's link ordering with the old prioritized/other split.
+
+Run from the repository root:
+
+    python benchmarks/bench_frontier.py
+
+Search results pages are simulated with a fixed hidden yield per URL:
+social profiles show no address, directory listings and business contact
+pages usually do, and some businesses publish none at all. Both orderings
+get the same fetch budget per results page; the script reports emails
+found per fetch and the ordering cost per link.
+"""
+import os
+import random
+import sys
+import time
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frontier import Frontier
+from scrapper import BUSINESS_DIRECTORIES
+
+LINKS_PER_PAGE = 40
+FETCHES_PER_PAGE = 20
+
+SOCIAL_SITES = ['facebook.com', 'instagram.com', 'twitter.com', 'linkedin.com/company']
+BUSINESS_PAGES = {
+    # path: addresses shown when the business publishes any
+    '/': ['info'],
+    '/contact': ['info', 'sales'],
+    '/contact-us': ['info', 'sales'],
+    '/about-us': ['info'],
+    '/services/{}': [],
+    '/blog/{}': [],
+}
+
+def make_results_pages(pages, seed=0):
+    rng = random.Random(seed)
+    hosts = [f"business{i}.ae" for i in range(400)]
+    results = []
+    for _ in range(pages):
+        links = []
+        for _ in range(LINKS_PER_PAGE):
+            kind = rng.random()
+            if kind < 0.25:
+                links.append(f"https://www.{rng.choice(SOCIAL_SITES)}/{rng.randrange(10 ** 6)}")
+            elif kind < 0.35:
+                links.append(f"https://www.yell.com/biz/{rng.randrange(10 ** 6)}")
+            else:
+                path = rng.choice(list(BUSINESS_PAGES)).format(rng.randrange(1000))
+                links.append(f"https://www.{rng.choice(hosts)}{path}")
+        results.append(links)
+    return results
+
+def page_emails(url):
+    """The hidden addresses on a simulated page, fixed per URL"""
+    rng = random.Random(zlib.crc32(url.encode()))
+    host = url.split('/')[2]
+    if any(site in url for site in SOCIAL_SITES):
+        return set()
+    if 'yell.com' in url:
+        return {f"listing{rng.randrange(10 ** 6)}@example.ae"} if rng.random() < 0.7 else set()
+    # A fixed 40% of businesses publish no address at all
+    if zlib.crc32(host.encode()) % 10 < 4:
+        return set()
+    path = url[url.index('/', 8):]
+    for pattern, names in BUSINESS_PAGES.items():
+        if path == pattern or path.startswith(pattern.split('{')[0]) and '{' in pattern:
+            return {f"{name}@{host[4:]}" for name in names}
+    return set()
+
+def baseline_order(links):
+    """The ordering process_search_results used before the frontier"""
+    prioritized = []
+    other = []
+    for link in links:
+        if any(dir in link.lower() for dir in BUSINESS_DIRECTORIES):
+            prioritized.append(link)
+        else:
+            other.append(link)
+    return prioritized + other
+
+def run_baseline(results):
+    fetched, emails, ordering = set(), set(), 0.0
+    for links in results:
+        start = time.perf_counter()
+        ordered = baseline_order(links)
+        ordering += time.perf_counter() - start
+        taken = 0
+        for link in ordered:
+            if taken == FETCHES_PER_PAGE:
+                break
+            if link not in fetched:
+                fetched.add(link)
+                taken += 1
+                emails |= page_emails(link)
+    return len(fetched), len(emails), ordering
+
+def run_frontier(results):
+    frontier = Frontier(BUSINESS_DIRECTORIES)
+    fetched, emails, ordering = set(), set(), 0.0
+    for links in results:
+        start = time.perf_counter()
+        for link in links:
+            if link not in fetched:
+                frontier.push(link)
+        batch = []
+        while len(batch) < FETCHES_PER_PAGE:
+            entry = frontier.pop()
+            if entry is None:
+                break
+            if entry[0] not in fetched:
+                fetched.add(entry[0])
+                batch.append(entry[0])
+        ordering += time.perf_counter() - start
+        for link in batch:
+            found = page_emails(link)
+            emails |= found
+            start = time.perf_counter()
+            frontier.record(link, len(found))
+            ordering += time.perf_counter() - start
+    return len(fetched), len(emails), ordering
+
+def main():
+    for pages in (10, 30, 100):
+        results = make_results_pages(pages)
+        links = pages * LINKS_PER_PAGE
+        for name, run in (('baseline', run_baseline), ('frontier', run_frontier)):
+            fetches, emails, ordering = run(results)
+            print(f"{pages:>3} result pages, {name}: {emails:>5} unique emails from {fetches} fetches "
+                  f"({emails / fetches:.2f} per fetch), ordering {ordering / links * 1e6:.1f} us per link")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Compare per-page parse time of the search result link extraction backends.
+
+Run from the repository root:
+
+    python benchmarks/bench_link_extraction.py
+
+Backends whose dependency (lxml, beautifulsoup4) is not installed are skipped.
+"""
+import os
+import random
+import sys
+import time
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from link_extractors import LINK_EXTRACTORS, is_absolute_http
+
+def make_results_page(size_bytes, seed=0):
+    """Build a synthetic search results page of roughly size_bytes"""
+    rng = random.Random(seed)
+    blocks = [
+        '<li class="b_algo"><h2><a href="https://www.business%d.ae/contact-us">Business - Contact</a></h2>'
+        '<div class="b_caption"><p>Call or email us for a quote &amp; more information.</p></div></li>\n',
+        '<a href="/search?q=dentists+in+dubai&amp;first=%d" aria-label="Page">Next</a>\n',
+        '<script>var _G={ST:(new Date),Mkt:"en-US",IG:"%d"};</script>\n',
+        '<div class="b_ad"><a href="https://www.bing.com/aclick?ld=%d&amp;u=aHR0cHM6Ly9leGFtcGxl">Ad</a></div>\n',
+        '<style>.b_algo_%d{margin:0 0 28px;padding:0}</style>\n',
+    ]
+    parts = ['<!DOCTYPE html><html><head><title>results</title></head><body><ol id="b_results">\n']
+    total = len(parts[0])
+    while total < size_bytes:
+        block = rng.choice(blocks) % rng.randint(0, 10 ** 6)
+        parts.append(block)
+        total += len(block)
+    parts.append('</ol></body></html>')
+    return ''.join(parts)
+
+def urlparse_valid(href):
+    """The previous validation: a full urlparse per link"""
+    parsed = urlparse(href)
+    return bool(parsed.scheme and parsed.netloc)
+
+def bench(func, pages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            func(page)
+    elapsed = time.perf_counter() - start
+    return elapsed / (len(pages) * repeat) * 1000
+
+def main():
+    for size in (50_000, 250_000, 1_000_000):
+        pages = [make_results_page(size, seed=seed) for seed in range(5)]
+        repeat = max(1, 5_000_000 // (size * len(pages)))
+        expected = None
+        timings = []
+        for name, extractor in LINK_EXTRACTORS.items():
+            hrefs = [extractor.hrefs(page) for page in pages]
+            if expected is None:
+                expected = hrefs
+            assert hrefs == expected, f"{name} disagrees with {next(iter(LINK_EXTRACTORS))}"
+            timings.append(f"{name} {bench(extractor.hrefs, pages, repeat):7.2f} ms")
+        hrefs = [href for page_hrefs in expected for href in page_hrefs]
+        assert [is_absolute_http(href) for href in hrefs] == [urlparse_valid(href) for href in hrefs]
+        fast = bench(lambda _: [is_absolute_http(href) for href in hrefs], [None], 20)
+        slow = bench(lambda _: [urlparse_valid(href) for href in hrefs], [None], 20)
+        print(f"{size / 1_000:>5.0f} KB pages: " + ", ".join(timings) +
+              f" per page; URL check {fast:.2f} ms vs urlparse {slow:.2f} ms for {len(hrefs)} links")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+from playwright.async_api import async_playwright
+from navigation_policy import NavigationPolicy
+from robots import RobotsCache, playwright_fetcher
+
+logger = logging.getLogger(__name__)
+
+LAUNCH_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-features=IsolateOrigins,site-per-process',
+    '--disable-site-isolation-trials',
+    '--no-sandbox',
+    '--disable-setuid-sandbox'
+]
+
+# Realistic browser settings shared by every pooled context
+CONTEXT_OPTIONS = {
+    'viewport': {'width': 1920, 'height': 1080},
+    'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
+    'locale': 'en-US',
+    'timezone_id': 'America/New_York',
+    'geolocation': {'latitude': 40.7128, 'longitude': -74.0060},
+    'permissions': ['geolocation'],
+    'bypass_csp': True,
+    'extra_http_headers': {
+        'Accept-Language': 'en-US,en;q=0.9',
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+        'Accept-Encoding': 'gzip, deflate, br',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1',
+        'Sec-Fetch-Dest': 'document',
+        'Sec-Fetch-Mode': 'navigate',
+        'Sec-Fetch-Site': 'none',
+        'Sec-Fetch-User': '?1',
+        'DNT': '1'
+    }
+}
+
+class PooledContext:
+    """A browser context borrowed from a BrowserPool, with its navigation count"""
+
+    def __init__(self, context):
+        self.context = context
+        self.navigations = 0
+        context.on('request', self._on_request)
+
+    def _on_request(self, request):
+        # Count top-level document loads only
+        if request.is_navigation_request() and request.frame.parent_frame is None:
+            self.navigations += 1
+
+class BrowserPool:
+    """One long-lived Chromium shared by all scrapers.
+
+    Contexts are pre-launched, lent out with acquire()/release() (or the
+    context() helper) and recycled after max_navigations page loads so a
+    long batch does not keep growing in memory.
+    """
+
+    def __init__(self, headless: bool = True, warm_contexts: int = 2, max_contexts: int = 4,
+                 max_navigations: int = 100, navigation_policy: NavigationPolicy = None,
+                 launch_args=None, context_options=None):
+        self.headless = headless
+        self.warm_contexts = warm_contexts
+        self.max_navigations = max_navigations
+        self.navigation_policy = navigation_policy or NavigationPolicy()
+        self.launch_args = launch_args or LAUNCH_ARGS
+        self.context_options = context_options or CONTEXT_OPTIONS
+        self._slots = asyncio.Semaphore(max(1, max_contexts))
+        self._idle = []
+        self.playwright = None
+        self.browser = None
+        self.request_context = None
+        self.robots = None
+        self.contexts_created = 0
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def start(self):
+        """Launch the browser and pre-create the warm contexts"""
+        if self.browser is not None:
+            return
+        self.playwright = await async_playwright().start()
+        self.browser = await self.playwright.chromium.launch(headless=self.headless, args=self.launch_args)
+        
+        # robots.txt rules shared by every context, fetched outside the browser
+        self.request_context = await self.playwright.request.new_context(
+            user_agent=self.context_options.get('user_agent')
+        )
+        self.robots = RobotsCache(playwright_fetcher(self.request_context))
+        self._idle = list(await asyncio.gather(*(self._new_context() for _ in range(self.warm_contexts))))
+        logger.info(f"Browser pool started with {len(self._idle)} warm contexts")
+
+    async def _new_context(self) -> PooledContext:
+        context = await self.browser.new_context(**self.context_options)
+        await self.navigation_policy.install(context)
+        self.contexts_created += 1
+        return PooledContext(context)
+
+    async def acquire(self) -> PooledContext:
+        """Borrow a context, creating one if no warm context is idle"""
+        await self.start()
+        await self._slots.acquire()
+        try:
+            return self._idle.pop() if self._idle else await self._new_context()
+        except Exception:
+            self._slots.release()
+            raise
+
+    async def release(self, pooled: PooledContext):
+        """Return a context, recycling it once it has served enough navigations"""
+        try:
+            if pooled.navigations >= self.max_navigations:
+                logger.info(f"Recycling browser context after {pooled.navigations} navigations")
+                await pooled.context.close()
+                self._idle.append(await self._new_context())
+            else:
+                for page in list(pooled.context.pages):
+                    await page.close()
+                self._idle.append(pooled)
+        except Exception as e:
+            logger.error(f"Error releasing browser context: {str(e)}")
+        finally:
+            self._slots.release()
+
+    def context(self):
+        """Async context manager wrapping acquire()/release()"""
+        return _BorrowedContext(self)
+
+    async def close(self):
+        """Close every context, the browser and Playwright"""
+        for pooled in self._idle:
+            try:
+                await pooled.context.close()
+            except Exception as e:
+                logger.debug(f"Error closing browser context: {str(e)}")
+        self._idle = []
+        if self.request_context is not None:
+            await self.request_context.dispose()
+            self.request_context = None
+        if self.browser is not None:
+            await self.browser.close()
+            self.browser = None
+        if self.playwright is not None:
+            await self.playwright.stop()
+            self.playwright = None
+
+def add_browser_arguments(parser):
+    """Add the options configuring the shared BrowserPool to parser"""
+    parser.add_argument('--headed', action='store_true',
+                        help='Show the browser window, e.g. to solve a CAPTCHA by hand (default: headless)')
+
+class _BorrowedContext:
+    def __init__(self, pool: BrowserPool):
+        self.pool = pool
+        self.pooled = None
+
+    async def __aenter__(self) -> PooledContext:
+        self.pooled = await self.pool.acquire()
+        return self.pooled
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.pool.release(self.pooled)
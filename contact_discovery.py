@@ -0,0 +1,99 @@
+from urllib.parse import urlsplit
+
+# Path words that also appear under these prefixes and suffixes on many sites
+PATH_VARIANTS = {
+    'contact': ['/contact', '/contact-us'],
+    'about': ['/about', '/about-us'],
+    'team': ['/team', '/our-team']
+}
+
+def _bare_host(host: str) -> str:
+    host = (host or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+def email_matches_host(email: str, host: str) -> bool:
+    """True if the address belongs to the site, e.g. info@example.com on www.example.com"""
+    domain = email.rpartition('@')[2].lower()
+    host = _bare_host(host)
+    if not domain or not host:
+        return False
+    return domain == host or host.endswith('.' + domain) or domain.endswith('.' + host)
+
+class ContactDiscovery:
+    """Per-domain mini-crawl of likely contact pages.
+
+    `directories` is the scraper's list of directory sites and page words:
+    entries with a dot ("yell.com", "linkedin.com/company") are sites that
+    list many businesses and are never crawled or closed, while the other
+    entries ("contact", "team") become candidate paths. A domain is explored
+    once, fetching at most `budget` candidates and stopping at the first
+    address on the site's own domain; a domain that has produced such an
+    address is marked done, and callers should skip its remaining pages.
+    """
+
+    def __init__(self, directories, budget: int = 3):
+        self.budget = budget
+        self.directory_sites = [entry.lower().split('/')[0] for entry in directories if '.' in entry]
+        self.paths = []
+        for word in directories:
+            if '.' not in word:
+                self.paths.extend(PATH_VARIANTS.get(word.lower(), ['/' + word.lower()]))
+        self._explored = set()
+        self._done = set()
+        self.fetches = 0
+
+    def _site(self, url: str):
+        """The bare host of url, or None for directory sites and unparseable URLs"""
+        host = _bare_host(urlsplit(url).hostname)
+        if not host:
+            return None
+        if any(host == site or host.endswith('.' + site) for site in self.directory_sites):
+            return None
+        return host
+
+    def is_done(self, url: str) -> bool:
+        """True if url's domain has already yielded an address of its own"""
+        site = self._site(url)
+        return site is not None and site in self._done
+
+    def candidates(self, url: str) -> list:
+        """Contact page URLs to try on url's site, in order"""
+        parts = urlsplit(url)
+        landed = parts.path.rstrip('/').lower()
+        return [f"{parts.scheme}://{parts.netloc}{path}" for path in self.paths if path != landed]
+
+    async def explore(self, url: str, emails, fetch) -> set:
+        """Crawl url's domain for contact pages unless the landed page already did the job.
+
+        fetch(url) returns the set of emails on a page, or None if the page
+        was not fetched (already seen, disallowed); only real fetches count
+        against the budget. Returns the emails found by the crawl.
+        """
+        site = self._site(url)
+        if site is None or site in self._done:
+            return set()
+        if any(email_matches_host(email, site) for email in emails):
+            self._done.add(site)
+            return set()
+        if site in self._explored or self.budget <= 0:
+            return set()
+        self._explored.add(site)
+
+        found = set()
+        fetched = 0
+        for candidate in self.candidates(url):
+            if fetched >= self.budget or site in self._done:
+                break
+            page_emails = await fetch(candidate)
+            if page_emails is None:
+                continue
+            fetched += 1
+            self.fetches += 1
+            found.update(page_emails)
+            if any(email_matches_host(email, site) for email in page_emails):
+                self._done.add(site)
+        return found
+
+    def summary(self) -> str:
+        return (f"{len(self._explored)} domains explored with {self.fetches} fetches, "
+                f"{len(self._done)} domains with an address of their own")
@@ -0,0 +1,95 @@
+import sqlite3
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Default location, next to the valid_lists/ directory
+DEFAULT_DB_PATH = "domain_verdicts.db"
+
+# Keep good domains for a week, recheck failing ones after a day
+DEFAULT_POSITIVE_TTL = 7 * 24 * 3600
+DEFAULT_NEGATIVE_TTL = 24 * 3600
+
+# SQLite limits the number of bound parameters per statement
+_LOAD_CHUNK_SIZE = 500
+
+class DomainVerdictStore:
+    """Persistent SQLite store of domain verdicts shared across validator runs"""
+
+    def __init__(self, path: str = DEFAULT_DB_PATH, positive_ttl: float = DEFAULT_POSITIVE_TTL,
+                 negative_ttl: float = DEFAULT_NEGATIVE_TTL, flush_every: int = 100):
+        self.path = path
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.flush_every = max(1, flush_every)
+        self._pending = []
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS domain_verdicts (
+                domain TEXT PRIMARY KEY,
+                mx INTEGER NOT NULL,
+                a INTEGER NOT NULL,
+                http INTEGER NOT NULL,
+                tls INTEGER NOT NULL,
+                checked_at REAL NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+    def is_fresh(self, verdict: dict, now: float = None) -> bool:
+        """Check whether a stored verdict is still within its TTL"""
+        now = time.time() if now is None else now
+        positive = verdict['mx'] and verdict['a'] and verdict['http'] and verdict['tls']
+        ttl = self.positive_ttl if positive else self.negative_ttl
+        return now - verdict['checked_at'] < ttl
+
+    def load(self, domains) -> dict:
+        """Bulk load fresh verdicts for the given domains, keyed by domain"""
+        domains = list(domains)
+        now = time.time()
+        verdicts = {}
+        for i in range(0, len(domains), _LOAD_CHUNK_SIZE):
+            chunk = domains[i:i + _LOAD_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT domain, mx, a, http, tls, checked_at FROM domain_verdicts WHERE domain IN ({placeholders})",
+                chunk
+            )
+            for domain, mx, a, http, tls, checked_at in rows:
+                verdict = {
+                    'domain': domain, 'mx': bool(mx), 'a': bool(a),
+                    'http': bool(http), 'tls': bool(tls), 'checked_at': checked_at
+                }
+                if self.is_fresh(verdict, now):
+                    verdicts[domain] = verdict
+        return verdicts
+
+    def save(self, verdict: dict):
+        """Queue a verdict for writing; writes are flushed in batches"""
+        self._pending.append((
+            verdict['domain'], int(verdict['mx']), int(verdict['a']),
+            int(verdict['http']), int(verdict['tls']), verdict['checked_at']
+        ))
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """Write all queued verdicts to disk"""
+        if not self._pending:
+            return
+        try:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO domain_verdicts (domain, mx, a, http, tls, checked_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    self._pending
+                )
+            self._pending = []
+        except sqlite3.Error as e:
+            logger.error(f"Error writing domain verdicts to {self.path}: {str(e)}")
+
+    def close(self):
+        self.flush()
+        self.conn.close()
@@ -5,18 +5,126 @@ import asyncio
 import logging
 from urllib.parse import urlparse
 import ssl
-import OpenSSL
-from datetime import datetime
 import argparse
 import os
 import glob
+import time
+from domain_store import DomainVerdictStore, DEFAULT_DB_PATH
+from async_dns import AsyncDNSResolver
+from email_index import EmailIndex, DEFAULT_REVALIDATE_AFTER, add_email_index_arguments, open_email_index
+from records import RecordWriter, iter_records, make_record, now_iso
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class DomainValidator:
+# Servers that answer HEAD with these statuses often serve GET fine
+HEAD_FALLBACK_STATUSES = {400, 403, 405, 501}
+
+def new_verdict(domain: str) -> dict:
+    """Return an empty verdict for a domain; every check starts out failed"""
+    return {'domain': domain, 'mx': False, 'a': False, 'http': False, 'tls': False, 'checked_at': time.time()}
+
+def verdict_is_valid(verdict: dict) -> bool:
+    """A domain is valid when its DNS, HTTP and SSL checks all passed"""
+    return verdict['mx'] and verdict['a'] and verdict['http'] and verdict['tls']
+
+def transport_certificate_expiry(transport):
+    """Return the notAfter timestamp of the peer certificate on a TLS transport, or None"""
+    if transport is None:
+        return None
+    ssl_object = transport.get_extra_info('ssl_object')
+    if ssl_object is None:
+        return None
+    cert = ssl_object.getpeercert()
+    if not cert or 'notAfter' not in cert:
+        return None
+    return ssl.cert_time_to_seconds(cert['notAfter'])
+
+class CertificateCapturingResponse(aiohttp.ClientResponse):
+    """Response that notes the peer certificate expiry while its connection is open.
+
+    aiohttp hands the connection of a bodiless response (HEAD, 204) back to
+    the pool inside start(), before the caller ever sees the response.
+    """
+
+    peer_cert_expiry = None
+
+    async def start(self, connection):
+        self.peer_cert_expiry = transport_certificate_expiry(connection.transport)
+        return await super().start(connection)
+
+class DomainVerdictCache:
+    """In-process cache of domain verdicts that coalesces concurrent lookups"""
+
     def __init__(self):
+        self._verdicts = {}
+        self._in_flight = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def __len__(self):
+        return len(self._verdicts)
+
+    def get(self, domain: str):
+        return self._verdicts.get(domain)
+
+    def put(self, domain: str, verdict: dict):
+        self._verdicts[domain] = verdict
+
+    async def get_or_check(self, domain: str, check) -> dict:
+        """Return the verdict for domain, awaiting check(domain) only on a miss"""
+        verdict = self._verdicts.get(domain)
+        if verdict is not None:
+            self.hits += 1
+            return verdict
+
+        # Share the result of a check that is already running for this domain
+        future = self._in_flight.get(domain)
+        if future is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # The task running the check was cancelled; run it ourselves
+                return await self.get_or_check(domain, check)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[domain] = future
+        try:
+            verdict = await check(domain)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Avoid "exception was never retrieved" when nobody else was waiting
+            future.exception()
+            raise
+        else:
+            self._verdicts[domain] = verdict
+            future.set_result(verdict)
+            return verdict
+        finally:
+            del self._in_flight[domain]
+
+    def stats_summary(self) -> str:
+        lookups = self.hits + self.misses + self.coalesced
+        hit_rate = (self.hits + self.coalesced) / lookups * 100 if lookups else 0.0
+        return (f"{lookups} domain lookups, {self.misses} checked, {self.hits} cache hits, "
+                f"{self.coalesced} coalesced in-flight ({hit_rate:.1f}% served from cache)")
+
+class DomainValidator:
+    def __init__(self, concurrency: int = 20, per_domain_concurrency: int = 2, progress_interval: int = 50,
+                 verdict_store: DomainVerdictStore = None, resolver: AsyncDNSResolver = None,
+                 http_pool_size: int = 100, http_per_host_limit: int = 4, keepalive_timeout: float = 30.0,
+                 dns_cache_ttl: int = 300, http_timeout: float = 10.0, probe_mode: str = 'head',
+                 probe_max_bytes: int = 16 * 1024, probe_max_redirects: int = 5,
+                 email_index: EmailIndex = None, revalidate_after: float = DEFAULT_REVALIDATE_AFTER):
         self.disposable_domains = set()  # You can load this from a file
         self.news_domains = {
             'gulfnews.com', 'khaleejtimes.com', 'thenational.ae', 
@@ -32,59 +140,211 @@ class DomainValidator:
         os.makedirs(self.output_dir, exist_ok=True)
         os.makedirs(self.input_dir, exist_ok=True)
         
-    async def is_domain_active(self, domain: str) -> bool:
-        """Check if a domain is active by performing DNS and HTTP checks"""
+        # Concurrency limits for validate_emails
+        self.concurrency = max(1, concurrency)
+        self.per_domain_concurrency = max(1, per_domain_concurrency)
+        self.progress_interval = max(1, progress_interval)
+        self._domain_semaphores = {}
+        
+        # Per-run cache so each domain is checked only once
+        self.verdict_cache = DomainVerdictCache()
+        
+        # Optional on-disk store so verdicts survive across runs
+        self.verdict_store = verdict_store
+        
+        # Optional cross-run index of addresses; recently validated ones are skipped
+        self.email_index = email_index
+        self.revalidate_after = revalidate_after
+        
+        # Non-blocking DNS resolver shared by all domain checks
+        self.resolver = resolver or AsyncDNSResolver()
+        
+        # Settings for the long-lived HTTP session used by liveness checks
+        self.http_pool_size = http_pool_size
+        self.http_per_host_limit = http_per_host_limit
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.http_timeout = http_timeout
+        
+        # Liveness probe budget: 'head' tries HEAD before a capped GET,
+        # 'get' goes straight to the capped GET
+        self.probe_mode = probe_mode
+        self.probe_timeout = http_timeout
+        self.probe_max_bytes = probe_max_bytes
+        self.probe_max_redirects = probe_max_redirects
+        self._session = None
+        
+    async def __aenter__(self):
+        self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.http_pool_size,
+                limit_per_host=self.http_per_host_limit,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.http_timeout),
+                response_class=CertificateCapturingResponse
+            )
+        return self._session
+
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        
+    @staticmethod
+    def normalize_domain(domain: str) -> str:
+        """Normalize a domain or URL to a bare lowercase host name"""
+        domain = domain.lower().strip()
+        if '://' in domain:
+            domain = urlparse(domain).netloc
+        if '/' in domain:
+            domain = domain.split('/')[0]
+        return domain.rstrip('.')
+
+    async def check_domain(self, domain: str) -> dict:
+        """Return the cached verdict for a domain, running the checks at most once"""
+        domain = self.normalize_domain(domain)
+        return await self.verdict_cache.get_or_check(domain, self._check_and_store_domain)
+
+    async def _check_and_store_domain(self, domain: str) -> dict:
+        verdict = await self._check_domain(domain)
+        if self.verdict_store is not None:
+            self.verdict_store.save(verdict)
+        return verdict
+
+    def warm_verdict_cache(self, emails) -> int:
+        """Bulk load stored verdicts for the domains of these emails into the cache"""
+        if self.verdict_store is None:
+            return 0
+        domains = {self.normalize_domain(email.rsplit('@', 1)[-1]) for email in emails if '@' in email}
+        domains = [domain for domain in domains if self.verdict_cache.get(domain) is None]
+        verdicts = self.verdict_store.load(domains)
+        for domain, verdict in verdicts.items():
+            self.verdict_cache.put(domain, verdict)
+        logger.info(f"Loaded {len(verdicts)} of {len(domains)} domain verdicts from {self.verdict_store.path}")
+        return len(verdicts)
+
+    async def _check_domain(self, domain: str) -> dict:
+        """Run the DNS, HTTP and SSL checks for a normalized domain"""
+        verdict = new_verdict(domain)
+
+        # Check if it's a disposable or system domain
+        if domain in self.disposable_domains or domain in self.system_domains:
+            return verdict
+
         try:
-            # Remove any protocol and path
-            domain = domain.lower().strip()
-            if '://' in domain:
-                domain = urlparse(domain).netloc
-            if '/' in domain:
-                domain = domain.split('/')[0]
-            
-            # Check if it's a disposable or system domain
-            if domain in self.disposable_domains or domain in self.system_domains:
-                return False
-                
-            # Check DNS records
+            # Check DNS records, querying MX and A in parallel
             try:
+                mx_records, a_records = await self.resolver.resolve_mx_and_a(domain)
+                
                 # Check MX records
-                mx_records = dns.resolver.resolve(domain, 'MX')
+                if isinstance(mx_records, BaseException):
+                    raise mx_records
                 if not mx_records:
                     logger.warning(f"No MX records found for {domain}")
-                    return False
+                    return verdict
+                verdict['mx'] = True
                     
                 # Check A records
-                a_records = dns.resolver.resolve(domain, 'A')
+                if isinstance(a_records, BaseException):
+                    raise a_records
                 if not a_records:
                     logger.warning(f"No A records found for {domain}")
-                    return False
+                    return verdict
+                verdict['a'] = True
                     
             except dns.resolver.NXDOMAIN:
                 logger.warning(f"Domain {domain} does not exist")
-                return False
+                return verdict
             except dns.resolver.NoAnswer:
                 logger.warning(f"No DNS records found for {domain}")
-                return False
+                return verdict
             except Exception as e:
                 logger.error(f"DNS check error for {domain}: {str(e)}")
-                return False
+                return verdict
             
-            # Check if website is accessible
+            # Check if website is accessible, reading the SSL certificate
+            # from the same connection instead of a second handshake
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(f'https://{domain}', timeout=10) as response:
-                        if response.status < 400:  # 2xx and 3xx status codes are good
-                            return True
-                        logger.warning(f"Website {domain} returned status {response.status}")
-                        return False
+                status, cert_expiry = await self.probe_domain(domain)
+                if status >= 400:  # 2xx and 3xx status codes are good
+                    logger.warning(f"Website {domain} returned status {status}")
+                    return verdict
+                verdict['http'] = True
+            except aiohttp.ClientConnectorCertificateError as e:
+                logger.warning(f"SSL certificate rejected for {domain}: {str(e.certificate_error)}")
+                return verdict
             except Exception as e:
                 logger.error(f"HTTP check error for {domain}: {str(e)}")
-                return False
+                return verdict
+
+            # The handshake verified the certificate chain; double-check expiry when available
+            if cert_expiry is not None and cert_expiry < time.time():
+                logger.warning(f"SSL certificate expired for {domain}")
+                return verdict
+            verdict['tls'] = True
+
+            return verdict
                 
         except Exception as e:
             logger.error(f"Error checking domain {domain}: {str(e)}")
-            return False
+            return verdict
+
+    @staticmethod
+    def peer_certificate_expiry(response):
+        """Return the notAfter timestamp of the certificate a response was served with"""
+        return getattr(response, 'peer_cert_expiry', None)
+
+    async def probe_domain(self, domain: str):
+        """Probe https://domain without downloading the whole page.
+
+        Sends HEAD first and falls back to a GET that is closed after at most
+        probe_max_bytes of body. Returns (status, certificate expiry timestamp or None).
+        """
+        url = f'https://{domain}'
+        session = self._get_session()
+        deadline = time.monotonic() + self.probe_timeout
+
+        def remaining_timeout():
+            return aiohttp.ClientTimeout(total=max(0.1, deadline - time.monotonic()))
+
+        if self.probe_mode == 'head':
+            try:
+                async with session.head(url, allow_redirects=True, max_redirects=self.probe_max_redirects,
+                                        timeout=remaining_timeout()) as response:
+                    if response.status not in HEAD_FALLBACK_STATUSES:
+                        return response.status, self.peer_certificate_expiry(response)
+            except aiohttp.ClientConnectorError:
+                # The host is unreachable; a GET would fail the same way
+                raise
+            except (aiohttp.ClientResponseError, aiohttp.ServerDisconnectedError) as e:
+                logger.debug(f"HEAD probe failed for {domain}, retrying with GET: {str(e)}")
+
+        async with session.get(url, max_redirects=self.probe_max_redirects,
+                               timeout=remaining_timeout()) as response:
+            status = response.status
+            cert_expiry = self.peer_certificate_expiry(response)
+            # Read no more than probe_max_bytes of the body, then drop the connection
+            await response.content.read(self.probe_max_bytes)
+            response.close()
+            return status, cert_expiry
+
+    async def is_domain_active(self, domain: str) -> bool:
+        """Check if a domain is active by performing DNS and HTTP checks"""
+        verdict = await self.check_domain(domain)
+        return verdict['mx'] and verdict['a'] and verdict['http']
             
     async def is_valid_business_email(self, email: str) -> bool:
         """Check if an email is likely to be a valid business email"""
@@ -105,92 +365,152 @@ class DomainValidator:
             if any(pattern in local_part for pattern in business_patterns):
                 return True
                 
-            # Check if domain is active
-            if not await self.is_domain_active(domain):
-                return False
-                
-            # Check SSL certificate
-            try:
-                cert = ssl.get_server_certificate((domain, 443))
-                x509 = OpenSSL.crypto.load_certificate(OpenSSL.crypto.FILETYPE_PEM, cert)
-                expiry_date = datetime.strptime(x509.get_notAfter().decode('ascii'), '%Y%m%d%H%M%SZ')
-                if expiry_date < datetime.now():
-                    logger.warning(f"SSL certificate expired for {domain}")
-                    return False
-            except Exception as e:
-                logger.error(f"SSL check error for {domain}: {str(e)}")
-                return False
-                
-            return True
+            # Check if domain is active and has a valid SSL certificate
+            verdict = await self.check_domain(domain)
+            return verdict_is_valid(verdict)
             
         except Exception as e:
             logger.error(f"Error validating email {email}: {str(e)}")
             return False
             
+    def _domain_semaphore(self, email: str) -> asyncio.Semaphore:
+        """Return the semaphore limiting concurrent checks against one domain"""
+        domain = email.rsplit('@', 1)[-1].lower().strip()
+        semaphore = self._domain_semaphores.get(domain)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_domain_concurrency)
+            self._domain_semaphores[domain] = semaphore
+        return semaphore
+
+    async def _validate_one(self, email: str, global_semaphore: asyncio.Semaphore):
+        """Validate one email while holding the per-domain and global slots.
+
+        The domain slot is taken first so tasks queued behind a busy domain
+        wait without holding a global slot other domains could use.
+        """
+        async with self._domain_semaphore(email):
+            async with global_semaphore:
+                return email, await self.is_valid_business_email(email)
+
+    def known_results(self, emails) -> dict:
+        """Return {email: is_valid} for emails the index says were validated recently"""
+        if self.email_index is None:
+            return {}
+        return self.email_index.recently_validated(emails, self.revalidate_after)
+
+    def remember_result(self, email: str, is_valid: bool):
+        """Record a fresh validation result in the email index"""
+        if self.email_index is not None:
+            self.email_index.record_validation(email, is_valid)
+
+    async def iter_validated_emails(self, emails):
+        """Validate emails concurrently, yielding (email, is_valid) in completion order"""
+        emails = list(emails)
+        if not emails:
+            return
+        
+        # Addresses validated within the revalidation window are not checked again
+        known = self.known_results(emails)
+        if known:
+            logger.info(f"Skipping {len(known)} emails validated in the last {self.revalidate_after / 86400:g} days")
+            for email, is_valid in known.items():
+                yield email, is_valid
+            emails = [email for email in emails if email not in known]
+        total = len(emails)
+        if not total:
+            return
+
+        global_semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = [asyncio.create_task(self._validate_one(email, global_semaphore)) for email in emails]
+        done = 0
+        valid = 0
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                email, is_valid = await next_result
+                self.remember_result(email, is_valid)
+                done += 1
+                valid += is_valid
+                if done % self.progress_interval == 0 or done == total:
+                    logger.info(f"Validated {done}/{total} emails ({valid} valid so far)")
+                yield email, is_valid
+        finally:
+            # Cancel outstanding checks if the consumer stops early
+            for task in tasks:
+                task.cancel()
+
     async def validate_emails(self, emails: set) -> set:
         """Validate a set of emails and return only valid business emails"""
         valid_emails = set()
-        for email in emails:
-            if await self.is_valid_business_email(email):
+        async for email, is_valid in self.iter_validated_emails(emails):
+            if is_valid:
                 valid_emails.add(email)
         return valid_emails
 
     @staticmethod
-    def read_emails_from_file(file_path: str) -> set:
-        """Read emails from a text file"""
-        emails = set()
+    def read_records_from_file(file_path: str) -> dict:
+        """Read result records from a JSONL or legacy text file, keyed by email"""
+        records = {}
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    # Extract email from line (handles different formats)
-                    email = line.strip()
-                    if 'Email:' in line:
-                        email = line.split('Email:')[1].strip()
-                    if email and '@' in email:
-                        emails.add(email)
-            return emails
+            for record in iter_records(file_path):
+                # Keep the first sighting of each email
+                records.setdefault(record['email'], record)
+            return records
         except Exception as e:
             logger.error(f"Error reading file {file_path}: {str(e)}")
-            return set()
+            return {}
 
-    def write_emails_to_file(self, emails: set, output_file: str):
-        """Write validated emails to a text file"""
+    @staticmethod
+    def read_emails_from_file(file_path: str) -> set:
+        """Read emails from a JSONL or legacy text file"""
+        return set(DomainValidator.read_records_from_file(file_path))
+
+    def write_records_to_file(self, records, output_file: str):
+        """Write validated records to a JSONL file, stamping when they were validated"""
         try:
             # Ensure the output file is in the valid_lists directory
             if not output_file.startswith(self.output_dir):
                 output_file = os.path.join(self.output_dir, os.path.basename(output_file))
             
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(f"Validated Email Results\n")
-                f.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"Total Valid Emails: {len(emails)}\n")
-                f.write("=" * 50 + "\n\n")
-                
-                for email in sorted(emails):
-                    f.write(f"Email: {email}\n")
-                    f.write("-" * 30 + "\n")
+            validated_at = now_iso()
+            # Replace any earlier output, so re-validating a list does not duplicate records
+            with RecordWriter(output_file, flush_every=1000, truncate=True) as writer:
+                for record in records:
+                    writer.write(dict(record, validated_at=validated_at))
             
             logger.info(f"Validated emails saved to {output_file}")
         except Exception as e:
             logger.error(f"Error writing to file {output_file}: {str(e)}")
 
+    def write_emails_to_file(self, emails: set, output_file: str):
+        """Write validated emails without provenance"""
+        self.write_records_to_file((make_record(email) for email in sorted(emails)), output_file)
+
     async def process_file(self, input_file: str):
         """Process a single file from pre-validated_lists directory"""
         try:
             # Generate output filename
             base_name = os.path.splitext(os.path.basename(input_file))[0]
-            output_file = os.path.join(self.output_dir, f"{base_name}_validated.txt")
+            output_file = os.path.join(self.output_dir, f"{base_name}_validated.jsonl")
 
-            # Read emails from file
-            emails = self.read_emails_from_file(input_file)
+            # Read records from file, keeping their provenance
+            records = self.read_records_from_file(input_file)
+            emails = set(records)
             logger.info(f"Read {len(emails)} emails from {input_file}")
 
+            # Reuse verdicts from previous runs
+            self.warm_verdict_cache(emails)
+
             # Validate emails
             valid_emails = await self.validate_emails(emails)
             logger.info(f"Found {len(valid_emails)} valid emails out of {len(emails)} total emails")
+            logger.info(f"Domain cache: {self.verdict_cache.stats_summary()}")
+            if self.verdict_store is not None:
+                self.verdict_store.flush()
+            if self.email_index is not None:
+                self.email_index.flush()
 
             # Write results to file
-            self.write_emails_to_file(valid_emails, output_file)
+            self.write_records_to_file((records[email] for email in sorted(valid_emails)), output_file)
 
             # Delete the processed file
             os.remove(input_file)
@@ -203,8 +523,10 @@ class DomainValidator:
 
     async def process_all_files(self):
         """Process all files in the pre-validated_lists directory"""
-        # Get all .txt files in the input directory
-        input_files = glob.glob(os.path.join(self.input_dir, "*.txt"))
+        # Get all JSONL and legacy .txt files in the input directory
+        input_files = sorted(
+            glob.glob(os.path.join(self.input_dir, "*.jsonl")) + glob.glob(os.path.join(self.input_dir, "*.txt"))
+        )
         
         if not input_files:
             logger.info("No files found in pre-validated_lists directory")
@@ -217,23 +539,74 @@ class DomainValidator:
             logger.info(f"Processing file: {input_file}")
             await self.process_file(input_file)
 
+def add_validator_arguments(parser: argparse.ArgumentParser):
+    """Add the options configuring a DomainValidator to parser"""
+    parser.add_argument('--concurrency', type=int, default=20, help='Maximum number of emails validated at once')
+    parser.add_argument('--per-domain-limit', type=int, default=2, help='Maximum concurrent checks against a single domain')
+    parser.add_argument('--verdict-db', default=DEFAULT_DB_PATH, help='SQLite file caching domain verdicts across runs')
+    parser.add_argument('--no-verdict-db', action='store_true', help='Do not read or write the domain verdict store')
+    parser.add_argument('--nameserver', action='append', help='DNS server to query (repeatable, defaults to the system resolver)')
+    parser.add_argument('--dns-timeout', type=float, default=3.0, help='Seconds to wait for each DNS server')
+    parser.add_argument('--http-pool-size', type=int, default=100, help='Maximum open connections for liveness checks')
+    parser.add_argument('--probe-mode', choices=['head', 'get'], default='head', help='Send HEAD before falling back to a capped GET')
+    parser.add_argument('--probe-timeout', type=float, default=10.0, help='Seconds allowed for each liveness probe, including redirects')
+    parser.add_argument('--probe-max-bytes', type=int, default=16 * 1024, help='Most body bytes a GET probe reads before closing the connection')
+    parser.add_argument('--positive-ttl-hours', type=float, default=7 * 24, help='How long a passing domain verdict is reused')
+    parser.add_argument('--negative-ttl-hours', type=float, default=24, help='How long a failing domain verdict is reused')
+    parser.add_argument('--revalidate-days', type=float, default=DEFAULT_REVALIDATE_AFTER / 86400, help='Skip addresses validated more recently than this')
+    add_email_index_arguments(parser)
+
+def build_validator(args, email_index: EmailIndex = None):
+    """Create a DomainValidator and its verdict store (or None) from parsed arguments.
+
+    The email index is opened from args unless an already open one is given.
+    """
+    verdict_store = None
+    if not args.no_verdict_db:
+        verdict_store = DomainVerdictStore(
+            args.verdict_db,
+            positive_ttl=args.positive_ttl_hours * 3600,
+            negative_ttl=args.negative_ttl_hours * 3600
+        )
+    
+    validator = DomainValidator(
+        concurrency=args.concurrency,
+        per_domain_concurrency=args.per_domain_limit,
+        verdict_store=verdict_store,
+        resolver=AsyncDNSResolver(nameservers=args.nameserver, timeout=args.dns_timeout),
+        http_pool_size=args.http_pool_size,
+        http_timeout=args.probe_timeout,
+        probe_mode=args.probe_mode,
+        probe_max_bytes=args.probe_max_bytes,
+        email_index=email_index if email_index is not None else open_email_index(args),
+        revalidate_after=args.revalidate_days * 86400
+    )
+    return validator, verdict_store
+
 async def main():
     parser = argparse.ArgumentParser(description='Validate emails from pre-validated_lists directory')
     parser.add_argument('--single-file', help='Process a single file instead of all files in directory')
+    add_validator_arguments(parser)
     
     args = parser.parse_args()
+    validator, verdict_store = build_validator(args)
     
-    validator = DomainValidator()
-    
-    if args.single_file:
-        # Process single file
-        if not os.path.exists(args.single_file):
-            logger.error(f"File {args.single_file} does not exist")
-            return
-        await validator.process_file(args.single_file)
-    else:
-        # Process all files in directory
-        await validator.process_all_files()
+    try:
+        async with validator:
+            if args.single_file:
+                # Process single file
+                if not os.path.exists(args.single_file):
+                    logger.error(f"File {args.single_file} does not exist")
+                    return
+                await validator.process_file(args.single_file)
+            else:
+                # Process all files in directory
+                await validator.process_all_files()
+    finally:
+        if verdict_store is not None:
+            verdict_store.close()
+        if validator.email_index is not None:
+            validator.email_index.close()
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
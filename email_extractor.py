@@ -0,0 +1,161 @@
+import re
+
+# Pattern shared by every scraper; kept for callers that need the raw regex
+EMAIL_REGEX = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
+EMAIL_PATTERN = re.compile(EMAIL_REGEX)
+
+# Matches that are really asset file names such as logo@2x.png
+IGNORED_SUFFIXES = ('.png', '.jpg', '.jpeg', '.svg', '.gif', '.webp')
+
+# RFC 5321 limits the local part to 64 characters, so there is no point
+# looking further back than that from an '@'
+MAX_LOCAL_LENGTH = 64
+
+# The local part is matched on the reversed text in front of the '@', so the
+# regex engine stops at the first character that cannot belong to it
+_LOCAL_PART_REVERSED = re.compile(r"[a-zA-Z0-9._%+-]+")
+_DOMAIN_PART = re.compile(r"[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+
+def normalize_email(email: str):
+    """Lowercase an address, returning None for asset names like logo@2x.png"""
+    email = email.lower()
+    if email.endswith(IGNORED_SUFFIXES):
+        return None
+    return email
+
+def iter_emails(text: str, start: int = 0):
+    """Yield normalized emails found in text, in document order.
+
+    Only the neighbourhood of each '@' is scanned, which is far cheaper than
+    running EMAIL_PATTERN over the whole page when most of it is markup.
+    Matches are equivalent to EMAIL_PATTERN.finditer except that local parts
+    are capped at MAX_LOCAL_LENGTH characters.
+    """
+    find = text.find
+    last_end = start
+    at = find('@', start)
+    while at != -1:
+        lower_bound = max(last_end, at - MAX_LOCAL_LENGTH)
+        if at > lower_bound:
+            local = _LOCAL_PART_REVERSED.match(text[lower_bound:at][::-1])
+            if local:
+                domain = _DOMAIN_PART.match(text, at + 1)
+                if domain:
+                    last_end = domain.end()
+                    email = normalize_email(text[at - local.end():last_end])
+                    if email:
+                        yield email
+                    at = find('@', last_end)
+                    continue
+        at = find('@', at + 1)
+
+def extract_emails(text: str) -> set:
+    """Return the set of unique normalized emails in text"""
+    if not text or '@' not in text:
+        return set()
+    return set(iter_emails(text))
+
+# Characters that can appear anywhere in a match; an email never spans
+# anything else, so text can be split at any other character. Searching the
+# reversed text for the first other character finds where the trailing run
+# starts in linear time; a "run to the end of the text" regex backtracks
+# quadratically on long base64 or hex tokens.
+_EMAIL_RUN_BOUNDARY = re.compile(r"[^a-zA-Z0-9._%+@-]")
+
+# Longest trailing run kept between chunks before it is scanned anyway
+MAX_PENDING_RUN = 8192
+
+class StreamingEmailExtractor:
+    """Incremental version of extract_emails for text arriving in chunks.
+
+    Each chunk is scanned up to the last character that cannot be part of
+    an email; the run of email characters after it is carried over and
+    rescanned with the next chunk, so a match split across a chunk
+    boundary is found exactly once and memory stays bounded by the chunk
+    size instead of the page size.
+    """
+
+    def __init__(self):
+        self.emails = set()
+        self._pending = ''
+
+    def reset(self):
+        self.emails = set()
+        self._pending = ''
+
+    def feed(self, chunk: str):
+        text = self._pending + chunk
+        # The pending text is itself a run of email characters, so only the
+        # new chunk needs searching for the start of the trailing run
+        boundary = _EMAIL_RUN_BOUNDARY.search(chunk[::-1])
+        run_start = len(text) - boundary.start() if boundary else 0
+        if len(text) - run_start > MAX_PENDING_RUN:
+            if '@' in text[run_start:]:
+                # Pathological run; scan it now rather than letting it grow
+                run_start = len(text)
+            else:
+                # Only the last MAX_LOCAL_LENGTH characters can start a local part
+                run_start = len(text) - MAX_LOCAL_LENGTH
+        if '@' in text[:run_start]:
+            self.emails.update(iter_emails(text[:run_start]))
+        self._pending = text[run_start:]
+
+    def finish(self) -> set:
+        """Scan whatever is still pending and return every email found"""
+        if '@' in self._pending:
+            self.emails.update(iter_emails(self._pending))
+        self._pending = ''
+        return self.emails
+
+# Runs inside the page: scans text nodes, JSON-LD blocks and mailto: links
+# and returns only the unique matches, so the DOM never crosses the
+# Playwright channel
+EMAIL_EXTRACTION_JS = """([pattern, ignoredSuffixes]) => {
+    const regex = new RegExp(pattern, 'g');
+    const found = new Set();
+    const scan = (text) => {
+        if (!text || text.indexOf('@') === -1) return;
+        for (const match of text.matchAll(regex)) {
+            const email = match[0].toLowerCase();
+            if (!ignoredSuffixes.some(suffix => email.endsWith(suffix))) found.add(email);
+        }
+    };
+
+    const walker = document.createTreeWalker(document.documentElement, NodeFilter.SHOW_TEXT, {
+        acceptNode(node) {
+            const parent = node.parentElement;
+            if (!parent) return NodeFilter.FILTER_ACCEPT;
+            const tag = parent.tagName;
+            if (tag === 'STYLE' || tag === 'NOSCRIPT') return NodeFilter.FILTER_REJECT;
+            if (tag === 'SCRIPT' && parent.type !== 'application/ld+json') return NodeFilter.FILTER_REJECT;
+            return NodeFilter.FILTER_ACCEPT;
+        }
+    });
+    while (walker.nextNode()) scan(walker.currentNode.data);
+
+    for (const link of document.querySelectorAll('a[href^="mailto:" i]')) {
+        let href = link.getAttribute('href');
+        try { href = decodeURIComponent(href); } catch (e) {}
+        scan(href);
+    }
+    return Array.from(found);
+}"""
+
+async def extract_emails_from_playwright_page(page, mode: str = 'dom') -> set:
+    """Extract emails from a Playwright page.
+
+    'dom' runs the matcher inside the page and only transfers the matches;
+    'content' serializes the whole DOM with page.content() and scans it here.
+    """
+    if mode == 'content':
+        return extract_emails(await page.content())
+
+    matches = await page.evaluate(EMAIL_EXTRACTION_JS, [EMAIL_REGEX, list(IGNORED_SUFFIXES)])
+    emails = set()
+    for match in matches:
+        # JavaScript regex semantics differ slightly; re-check on this side
+        if EMAIL_PATTERN.fullmatch(match):
+            email = normalize_email(match)
+            if email:
+                emails.add(email)
+    return emails
@@ -0,0 +1,161 @@
+import argparse
+import logging
+import sqlite3
+import time
+from records import iter_records
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = "email_index.db"
+
+# Addresses validated more recently than this are not validated again
+DEFAULT_REVALIDATE_AFTER = 30 * 24 * 3600
+
+# SQLite limits the number of bound parameters per statement
+_LOAD_CHUNK_SIZE = 500
+
+STATUS_NEW = 'new'
+STATUS_VALID = 'valid'
+STATUS_INVALID = 'invalid'
+
+def normalize_address(email: str) -> str:
+    return email.strip().lower()
+
+class EmailIndex:
+    """Persistent SQLite index of every address seen across runs.
+
+    One row per normalized address with the provenance of its first
+    sighting, first/last seen times and the latest validation status.
+    Sightings and validation results are queued and written in batches.
+    """
+
+    def __init__(self, path: str = DEFAULT_INDEX_PATH, flush_every: int = 100):
+        self.path = path
+        self.flush_every = max(1, flush_every)
+        self._pending_seen = []
+        self._pending_status = []
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS emails (
+                email TEXT PRIMARY KEY,
+                source_url TEXT,
+                engine TEXT,
+                query TEXT,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                status TEXT NOT NULL DEFAULT 'new',
+                validated_at REAL
+            )
+        """)
+        self.conn.commit()
+
+    def record_seen(self, records):
+        """Queue sightings of result records (or bare emails) for an upsert"""
+        now = time.time()
+        for record in records:
+            if isinstance(record, str):
+                record = {'email': record}
+            self._pending_seen.append((
+                normalize_address(record['email']), record.get('source_url'),
+                record.get('engine'), record.get('query'), now, now
+            ))
+        if len(self._pending_seen) >= self.flush_every:
+            self.flush()
+
+    def record_validation(self, email: str, is_valid: bool, validated_at: float = None):
+        """Queue the validation result for an address"""
+        validated_at = time.time() if validated_at is None else validated_at
+        status = STATUS_VALID if is_valid else STATUS_INVALID
+        self._pending_status.append((normalize_address(email), validated_at, validated_at, status, validated_at))
+        if len(self._pending_status) >= self.flush_every:
+            self.flush()
+
+    def recently_validated(self, emails, window: float = DEFAULT_REVALIDATE_AFTER) -> dict:
+        """Return {email: is_valid} for the emails validated within the last `window` seconds"""
+        self.flush()
+        by_address = {}
+        for email in emails:
+            by_address.setdefault(normalize_address(email), []).append(email)
+        addresses = list(by_address)
+        cutoff = time.time() - window
+        results = {}
+        for i in range(0, len(addresses), _LOAD_CHUNK_SIZE):
+            chunk = addresses[i:i + _LOAD_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT email, status FROM emails WHERE email IN ({placeholders}) "
+                f"AND status != '{STATUS_NEW}' AND validated_at >= ?",
+                chunk + [cutoff]
+            )
+            for address, status in rows:
+                for email in by_address[address]:
+                    results[email] = status == STATUS_VALID
+        return results
+
+    def flush(self):
+        """Write all queued sightings and validation results to disk"""
+        if not self._pending_seen and not self._pending_status:
+            return
+        try:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT INTO emails (email, source_url, engine, query, first_seen, last_seen) "
+                    "VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(email) DO UPDATE SET last_seen = excluded.last_seen",
+                    self._pending_seen
+                )
+                self.conn.executemany(
+                    "INSERT INTO emails (email, first_seen, last_seen, status, validated_at) "
+                    "VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(email) DO UPDATE SET status = excluded.status, validated_at = excluded.validated_at",
+                    self._pending_status
+                )
+            self._pending_seen = []
+            self._pending_status = []
+        except sqlite3.Error as e:
+            logger.error(f"Error writing email index {self.path}: {str(e)}")
+
+    def stats(self) -> dict:
+        """Count indexed addresses by validation status"""
+        self.flush()
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM emails GROUP BY status"))
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+def add_email_index_arguments(parser: argparse.ArgumentParser):
+    """Add the options locating the email index to parser"""
+    parser.add_argument('--email-index', default=DEFAULT_INDEX_PATH, help='SQLite index of every address seen across runs')
+    parser.add_argument('--no-email-index', action='store_true', help='Do not read or write the email index')
+
+def open_email_index(args):
+    """Open the email index selected on the command line, or None"""
+    if args.no_email_index:
+        return None
+    return EmailIndex(args.email_index)
+
+def main():
+    parser = argparse.ArgumentParser(description='Import existing result lists into the email index')
+    parser.add_argument('files', nargs='*', help='JSONL or legacy text lists to import')
+    parser.add_argument('--validated', action='store_true', help='Mark the imported addresses as validated')
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH, help='Email index to update')
+    args = parser.parse_args()
+
+    index = EmailIndex(args.index)
+    try:
+        for path in args.files:
+            imported = 0
+            for record in iter_records(path):
+                index.record_seen([record])
+                if args.validated:
+                    index.record_validation(record['email'], True)
+                imported += 1
+            print(f"[+] Imported {imported} records from {path}")
+        print(f"[*] Index {args.index}: {index.stats()}")
+    finally:
+        index.close()
+
+if __name__ == "__main__":
+    main()
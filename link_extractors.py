@@ -0,0 +1,118 @@
+import logging
+from html.parser import HTMLParser
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+
+logger = logging.getLogger(__name__)
+
+def is_absolute_http(href: str) -> bool:
+    """Cheap stand-in for urlparse: an http(s) URL with a non-empty host"""
+    if href.startswith('https://'):
+        host_start = 8
+    elif href.startswith('http://'):
+        host_start = 7
+    else:
+        return False
+    return len(href) > host_start and href[host_start] not in '/?#'
+
+class _HrefCollector(HTMLParser):
+    """Tokenizer that only looks at <a> start tags; no tree is built"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.hrefs = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'a':
+            for name, value in attrs:
+                if name == 'href' and value:
+                    self.hrefs.append(value)
+                    break
+
+class HTMLParserLinkExtractor:
+    """Standard-library backend built on html.parser's tokenizer"""
+
+    name = 'htmlparser'
+
+    def hrefs(self, html: str) -> list:
+        collector = _HrefCollector()
+        collector.feed(html)
+        collector.close()
+        return collector.hrefs
+
+class _LxmlHrefTarget:
+    """lxml parser target: receives start events instead of building a tree"""
+
+    def __init__(self):
+        self.hrefs = []
+
+    def start(self, tag, attrib):
+        if tag == 'a':
+            href = attrib.get('href')
+            if href:
+                self.hrefs.append(href)
+
+    def end(self, tag):
+        pass
+
+    def data(self, data):
+        pass
+
+    def close(self):
+        return self.hrefs
+
+class LxmlLinkExtractor:
+    """libxml2 backend using a parser target, so no element tree is built"""
+
+    name = 'lxml'
+
+    def hrefs(self, html: str) -> list:
+        parser = etree.HTMLParser(target=_LxmlHrefTarget())
+        parser.feed(html)
+        return parser.close()
+
+class BeautifulSoupLinkExtractor:
+    """Full-tree backend; slowest, but the most forgiving with broken markup"""
+
+    name = 'bs4'
+
+    def hrefs(self, html: str) -> list:
+        soup = BeautifulSoup(html, "html.parser")
+        return [a['href'] for a in soup.find_all("a", href=True)]
+
+# Backends whose dependency is installed, fastest first
+LINK_EXTRACTORS = {}
+if etree is not None:
+    LINK_EXTRACTORS['lxml'] = LxmlLinkExtractor()
+LINK_EXTRACTORS['htmlparser'] = HTMLParserLinkExtractor()
+if BeautifulSoup is not None:
+    LINK_EXTRACTORS['bs4'] = BeautifulSoupLinkExtractor()
+
+def get_link_extractor(name: str = 'auto'):
+    """Return the named backend, or the fastest installed one for 'auto'"""
+    if name == 'auto':
+        return next(iter(LINK_EXTRACTORS.values()))
+    try:
+        return LINK_EXTRACTORS[name]
+    except KeyError:
+        raise ValueError(f"Link extractor {name!r} is not available; installed: {', '.join(LINK_EXTRACTORS)}")
+
+def extract_hrefs(html: str, backend: str = 'auto') -> list:
+    """Raw href values of every <a> in html, falling back to BeautifulSoup if the backend fails"""
+    extractor = get_link_extractor(backend)
+    try:
+        return extractor.hrefs(html)
+    except Exception as e:
+        fallback = LINK_EXTRACTORS.get('bs4')
+        if fallback is None or extractor is fallback:
+            raise
+        logger.debug(f"{extractor.name} link extraction failed, falling back to bs4: {str(e)}")
+        return fallback.hrefs(html)
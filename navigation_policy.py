@@ -0,0 +1,81 @@
+import logging
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Resource types that never contain the addresses we are looking for
+BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font', 'stylesheet'}
+
+# Analytics, ad and tracking hosts; subdomains are matched too
+TRACKER_DOMAINS = (
+    'google-analytics.com',
+    'googletagmanager.com',
+    'googlesyndication.com',
+    'googleadservices.com',
+    'doubleclick.net',
+    'adservice.google.com',
+    'facebook.net',
+    'hotjar.com',
+    'clarity.ms',
+    'scorecardresearch.com',
+    'quantserve.com',
+    'segment.io',
+    'segment.com',
+    'mixpanel.com',
+    'newrelic.com',
+    'nr-data.net',
+    'criteo.com',
+    'taboola.com',
+    'outbrain.com',
+    'adsrvr.org',
+    'amazon-adsystem.com',
+)
+
+class NavigationPolicy:
+    """Route-interception and wait policy for visiting result pages"""
+
+    def __init__(self, blocked_resource_types=BLOCKED_RESOURCE_TYPES, tracker_domains=TRACKER_DOMAINS,
+                 wait_until: str = 'domcontentloaded', timeout: int = 30000,
+                 late_extraction_delay: int = 0):
+        self.blocked_resource_types = set(blocked_resource_types)
+        self.tracker_domains = tuple(tracker_domains)
+        self.wait_until = wait_until
+        self.timeout = timeout
+        # Milliseconds to wait before extracting a second time to catch
+        # addresses rendered by scripts; 0 disables re-extraction
+        self.late_extraction_delay = late_extraction_delay
+        self.blocked_requests = 0
+
+    def is_tracker(self, url: str) -> bool:
+        host = urlparse(url).hostname or ''
+        return any(host == domain or host.endswith('.' + domain) for domain in self.tracker_domains)
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if resource_type == 'document':
+            return False
+        return resource_type in self.blocked_resource_types or self.is_tracker(url)
+
+    async def _handle_route(self, route):
+        request = route.request
+        if self.should_block(request.resource_type, request.url):
+            self.blocked_requests += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def install(self, context):
+        """Start intercepting requests for every page in a browser context"""
+        await context.route('**/*', self._handle_route)
+
+    async def visit(self, page, url: str, extract) -> set:
+        """Navigate to url and return the emails found by extract(page).
+
+        Extraction runs as soon as the DOM is ready; with a late extraction
+        delay configured the page is scanned a second time afterwards.
+        """
+        await page.goto(url, wait_until=self.wait_until, timeout=self.timeout)
+        emails = set(await extract(page))
+        if self.late_extraction_delay:
+            await page.wait_for_timeout(self.late_extraction_delay)
+            emails.update(await extract(page))
+        return emails
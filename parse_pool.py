@@ -0,0 +1,136 @@
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from email_extractor import extract_emails
+from link_extractors import extract_hrefs, is_absolute_http
+from url_index import canonicalize_url, unwrap_redirect
+
+logger = logging.getLogger(__name__)
+
+def _as_text(payload) -> str:
+    if isinstance(payload, bytes):
+        return payload.decode('utf-8', errors='replace')
+    return payload
+
+def extract_links(html, backend: str = 'auto') -> list:
+    """Return the unique absolute links of a search results page, with click-tracking unwrapped.
+
+    Malformed hrefs are dropped here so one bad link cannot fail the page later on.
+    """
+    links = set()
+    for href in extract_hrefs(_as_text(html), backend):
+        # Resolve search engine click-tracking links to their destination
+        href = unwrap_redirect(href)
+        if not is_absolute_http(href):
+            continue
+        try:
+            canonicalize_url(href)
+        except ValueError:
+            continue
+        links.add(href)
+    return list(links)
+
+def extract_page_emails(text) -> list:
+    return list(extract_emails(_as_text(text)))
+
+_TASKS = {
+    'links': extract_links,
+    'emails': extract_page_emails
+}
+
+def _run_batch(jobs):
+    """Worker entry point: run a batch of (task, payload, options) jobs, capturing errors per job"""
+    results = []
+    for task, payload, options in jobs:
+        try:
+            results.append((True, _TASKS[task](payload, **options)))
+        except Exception as e:
+            results.append((False, f"{type(e).__name__}: {e}"))
+    return results
+
+class ParsePool:
+    """Process pool for HTML parsing and email extraction.
+
+    Pages are queued into batches that go to a worker in a single executor
+    call, flushed once batch_size jobs or batch_bytes of payload have built
+    up or max_delay seconds after the first job, so small pages share one
+    round trip. Payloads under inline_below bytes are cheaper to handle on
+    the event loop than to ship to another process and never leave it.
+    """
+
+    def __init__(self, workers: int = 2, batch_size: int = 8, batch_bytes: int = 1024 * 1024,
+                 max_delay: float = 0.01, inline_below: int = 8 * 1024, link_backend: str = 'auto'):
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.batch_bytes = batch_bytes
+        self.max_delay = max_delay
+        self.inline_below = inline_below
+        self.link_backend = link_backend
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self._batch = []
+        self._batch_size_bytes = 0
+        self._timer = None
+        self.batches = 0
+        self.jobs = 0
+        self.inline = 0
+
+    async def links(self, html) -> list:
+        """Links of a search results page, parsed in a worker"""
+        return await self._submit('links', html, backend=self.link_backend)
+
+    async def emails(self, text) -> set:
+        """Emails in a page, extracted in a worker"""
+        return set(await self._submit('emails', text))
+
+    async def _submit(self, task: str, payload, **options):
+        if len(payload) < self.inline_below:
+            self.inline += 1
+            return _TASKS[task](payload, **options)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._batch.append((task, payload, options, future))
+        self._batch_size_bytes += len(payload)
+        self.jobs += 1
+        if len(self._batch) >= self.batch_size or self._batch_size_bytes >= self.batch_bytes:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._batch = self._batch, []
+        self._batch_size_bytes = 0
+        if not batch:
+            return
+        self.batches += 1
+        jobs = [(task, payload, options) for task, payload, options, _ in batch]
+        futures = [future for *_, future in batch]
+        done = asyncio.get_running_loop().run_in_executor(self.executor, _run_batch, jobs)
+        done.add_done_callback(lambda result: self._deliver(result, futures))
+
+    @staticmethod
+    def _deliver(result, futures):
+        if result.cancelled() or result.exception() is not None:
+            error = result.exception() if not result.cancelled() else asyncio.CancelledError()
+            for future in futures:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for future, (ok, value) in zip(futures, result.result()):
+            if future.done():
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(RuntimeError(value))
+
+    def summary(self) -> str:
+        return f"{self.jobs} pages in {self.batches} worker batches, {self.inline} small pages parsed inline"
+
+    def close(self):
+        self._flush()
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from domain_validator import DomainValidator, add_validator_arguments, build_validator
+from seen_sets import new_seen_set
+from records import RecordWriter, make_record, now_iso
+
+logger = logging.getLogger(__name__)
+
+class ValidationPipeline:
+    """Validate scraped emails while scraping is still running.
+
+    Scrapers submit() records (or bare addresses) as they find them; a bounded queue feeds a
+    fixed set of DomainValidator workers, so a backlog of unvalidated emails
+    slows the scraper down instead of growing without limit. Every valid
+    record is appended to the JSONL output_file (in valid_lists/) as soon as
+    it is confirmed, so a crash keeps everything validated up to that point.
+    """
+
+    def __init__(self, validator: DomainValidator, output_file: str, queue_size: int = 500,
+                 workers: int = None, owns_validator: bool = False, seen=None):
+        self.validator = validator
+        self.owns_validator = owns_validator  # close the validator and its store with the pipeline
+        if not output_file.startswith(validator.output_dir):
+            output_file = os.path.join(validator.output_dir, os.path.basename(output_file))
+        self.output_file = output_file
+        self.queue = asyncio.Queue(maxsize=max(1, queue_size))
+        self.worker_count = workers or validator.concurrency
+        self._workers = []
+        self._writer = None
+        self._submitted = set() if seen is None else seen
+        self.started_at = None
+        self.first_valid_after = None
+        self.validated = 0
+        self.valid = 0
+        self.skipped = 0
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def start(self):
+        """Open the output file and start the validation workers"""
+        self.started_at = time.monotonic()
+        self._writer = RecordWriter(self.output_file)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.worker_count)]
+        logger.info(f"Validation pipeline started with {self.worker_count} workers, writing to {self.output_file}")
+
+    @staticmethod
+    def _as_record(item) -> dict:
+        return make_record(item) if isinstance(item, str) else item
+
+    async def submit(self, item):
+        """Queue one record or email for validation, waiting while the queue is full"""
+        record = self._as_record(item)
+        email = record['email'].strip().lower()
+        if not email or email in self._submitted:
+            return
+        self._submitted.add(email)
+        await self.queue.put(record)
+
+    async def submit_many(self, items):
+        """Queue several records or emails, loading any stored domain verdicts first"""
+        records = [self._as_record(item) for item in items]
+        records = [record for record in records if record['email'].strip().lower() not in self._submitted]
+        if not records:
+            return
+        
+        # Addresses the email index knows to be valid go straight to the output
+        known = self.validator.known_results(record['email'] for record in records)
+        if known:
+            for record in records:
+                if record['email'] in known and record['email'].strip().lower() not in self._submitted:
+                    self._submitted.add(record['email'].strip().lower())
+                    self.skipped += 1
+                    if known[record['email']]:
+                        self._record_valid(record)
+            records = [record for record in records if record['email'] not in known]
+        
+        self.validator.warm_verdict_cache(record['email'] for record in records)
+        for record in records:
+            await self.submit(record)
+
+    async def _worker(self):
+        while True:
+            record = await self.queue.get()
+            email = record['email']
+            try:
+                async with self.validator._domain_semaphore(email):
+                    is_valid = await self.validator.is_valid_business_email(email)
+                self.validator.remember_result(email, is_valid)
+                self.validated += 1
+                if is_valid:
+                    self._record_valid(record)
+                if self.validated % self.validator.progress_interval == 0:
+                    logger.info(f"Pipeline validated {self.validated} emails ({self.valid} valid, {self.queue.qsize()} queued)")
+            except Exception as e:
+                logger.error(f"Error validating email {email}: {str(e)}")
+            finally:
+                self.queue.task_done()
+
+    def _record_valid(self, record: dict):
+        self.valid += 1
+        if self.first_valid_after is None:
+            self.first_valid_after = time.monotonic() - self.started_at
+            logger.info(f"First valid email after {self.first_valid_after:.1f}s")
+        self._writer.write(dict(record, validated_at=now_iso()))
+
+    async def close(self):
+        """Wait for queued emails to be validated, then stop the workers"""
+        if self._writer is None:
+            return
+        try:
+            await self.queue.join()
+        finally:
+            for worker in self._workers:
+                worker.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            self._workers = []
+            self._writer.close()
+            self._writer = None
+            if self.owns_validator:
+                await self.validator.close()
+                if self.validator.verdict_store is not None:
+                    self.validator.verdict_store.close()
+            elif self.validator.verdict_store is not None:
+                self.validator.verdict_store.flush()
+            if self.validator.email_index is not None:
+                self.validator.email_index.flush()
+        logger.info(f"Pipeline done: {self.valid} valid emails, {self.validated} validated and {self.skipped} "
+                    f"already known, saved to {self.output_file}")
+        logger.info(f"Domain cache: {self.validator.verdict_cache.stats_summary()}")
+
+def add_pipeline_arguments(parser):
+    """Add --pipeline and the validator options to a scraper's argument parser"""
+    parser.add_argument('--pipeline', action='store_true',
+                        help='Validate emails while scraping and append valid ones to valid_lists/')
+    parser.add_argument('--queue-size', type=int, default=500,
+                        help='Emails waiting for validation before scraping is held back')
+    add_validator_arguments(parser)
+
+def create_pipeline(args, source: str, email_index=None):
+    """Build the pipeline requested on the command line, or None without --pipeline.
+
+    The email index, if given, is shared with the scraper and stays owned by the caller.
+    """
+    if not args.pipeline:
+        return None
+    validator, _ = build_validator(args, email_index)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return ValidationPipeline(
+        validator, f"emails_{source}_{timestamp}_validated.jsonl",
+        queue_size=args.queue_size, owns_validator=True,
+        seen=new_seen_set(getattr(args, 'compact_seen', False))
+    )
@@ -0,0 +1,115 @@
+import asyncio
+import random
+import time
+from urllib.parse import urlparse
+
+class _HostState:
+    def __init__(self, min_delay: float, jitter: float, burst: int, max_in_flight: int):
+        self.min_delay = min_delay
+        self.jitter = jitter
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.in_flight = asyncio.Semaphore(max_in_flight)
+        self.lock = asyncio.Lock()
+        self.crawl_delay_checked = False
+
+class HostScheduler:
+    """Central per-host politeness scheduler.
+
+    Each host gets a token bucket refilled at one token per min_delay seconds
+    (plus up to `jitter` extra seconds per request) and a cap on requests in
+    flight. Hosts are independent, so requests to different sites run at full
+    concurrency. When crawl_delay_lookup is given it is awaited once per host
+    and a robots.txt Crawl-delay larger than min_delay takes precedence.
+    """
+
+    def __init__(self, min_delay: float = 1.0, max_in_flight: int = 2, burst: int = 1,
+                 jitter: float = 0.5, crawl_delay_lookup=None):
+        self.min_delay = min_delay
+        self.max_in_flight = max(1, max_in_flight)
+        self.burst = max(1, burst)
+        self.jitter = jitter
+        self.crawl_delay_lookup = crawl_delay_lookup
+        self._hosts = {}
+        self._overrides = {}
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return (urlparse(url).hostname or '').lower()
+
+    def set_min_delay(self, host: str, min_delay: float, jitter: float = None, max_in_flight: int = None):
+        """Override the delay, jitter and in-flight cap for one host"""
+        host = host.lower()
+        self._overrides[host] = (min_delay, jitter, max_in_flight)
+        state = self._hosts.get(host)
+        if state is not None:
+            state.min_delay = min_delay
+            if jitter is not None:
+                state.jitter = jitter
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            min_delay, jitter, max_in_flight = self._overrides.get(host, (self.min_delay, None, None))
+            state = _HostState(
+                min_delay,
+                self.jitter if jitter is None else jitter,
+                self.burst,
+                max_in_flight or self.max_in_flight
+            )
+            self._hosts[host] = state
+        return state
+
+    async def _apply_crawl_delay(self, host: str, url: str, state: _HostState):
+        state.crawl_delay_checked = True
+        try:
+            crawl_delay = await self.crawl_delay_lookup(url)
+        except Exception:
+            crawl_delay = None
+        if crawl_delay and crawl_delay > state.min_delay:
+            state.min_delay = float(crawl_delay)
+
+    async def _take_token(self, state: _HostState):
+        # The lock queues waiters per host so the bucket is never overdrawn
+        async with state.lock:
+            while True:
+                now = time.monotonic()
+                rate = 1.0 / state.min_delay if state.min_delay > 0 else float('inf')
+                state.tokens = min(state.burst, state.tokens + (now - state.updated) * rate)
+                state.updated = now
+                if state.tokens >= 1:
+                    state.tokens -= 1
+                    break
+                await asyncio.sleep((1 - state.tokens) / rate)
+            if state.jitter:
+                await asyncio.sleep(random.uniform(0, state.jitter))
+
+    def slot(self, url: str):
+        """Async context manager held for the duration of one request to url"""
+        return _HostSlot(self, url)
+
+class _HostSlot:
+    def __init__(self, scheduler: HostScheduler, url: str):
+        self.scheduler = scheduler
+        self.url = url
+        self.state = None
+
+    async def __aenter__(self):
+        host = self.scheduler.host_of(self.url)
+        state = self.scheduler._state(host)
+        if self.scheduler.crawl_delay_lookup is not None and not state.crawl_delay_checked:
+            async with state.lock:
+                if not state.crawl_delay_checked:
+                    await self.scheduler._apply_crawl_delay(host, self.url, state)
+        await state.in_flight.acquire()
+        try:
+            await self.scheduler._take_token(state)
+        except BaseException:
+            state.in_flight.release()
+            raise
+        self.state = state
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.state.in_flight.release()
@@ -0,0 +1,102 @@
+import argparse
+import csv
+import json
+import logging
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Column order for CSV export; records may carry extra keys such as validated_at
+RECORD_FIELDS = ['email', 'source_url', 'engine', 'query', 'found_at', 'validated_at']
+
+def now_iso() -> str:
+    return datetime.now().isoformat(timespec='seconds')
+
+def make_record(email: str, source_url: str = None, engine: str = None, query: str = None,
+                found_at: str = None) -> dict:
+    """Build a result record: one email plus where, how and when it was found"""
+    return {
+        'email': email,
+        'source_url': source_url,
+        'engine': engine,
+        'query': query,
+        'found_at': found_at or now_iso()
+    }
+
+class RecordWriter:
+    """JSONL writer, one record per line; appends unless truncate is set"""
+
+    def __init__(self, path: str, flush_every: int = 1, truncate: bool = False):
+        self.path = path
+        self.flush_every = max(1, flush_every)
+        self.written = 0
+        self._file = open(path, 'w' if truncate else 'a', encoding='utf-8')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def write(self, record: dict):
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.written += 1
+        if self.written % self.flush_every == 0:
+            self._file.flush()
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+def iter_records(path: str):
+    """Stream records from a JSONL file or a legacy "Email: x" text list.
+
+    Files are read line by line, so memory use does not grow with file size.
+    Legacy lines become records with only the email set.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith('{'):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning(f"Skipping malformed record on line {line_number} of {path}")
+                    continue
+                if record.get('email'):
+                    yield record
+                continue
+            # Legacy text format: "Email: x" lines between headers and separators
+            email = line.split('Email:', 1)[1].strip() if line.startswith('Email:') else line
+            if '@' in email and ' ' not in email:
+                record = make_record(email)
+                record['found_at'] = None  # not recorded by the old format
+                yield record
+
+def export_csv(records, csv_path: str) -> int:
+    """Write records to a CSV file, streaming; returns the number of rows"""
+    rows = 0
+    with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RECORD_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record)
+            rows += 1
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description='Export a result list (JSONL or legacy text) to CSV')
+    parser.add_argument('input', help='JSONL or legacy "Email:" text file')
+    parser.add_argument('output', help='CSV file to write')
+    args = parser.parse_args()
+    rows = export_csv(iter_records(args.input), args.output)
+    print(f"[✓] Exported {rows} records to {args.output}")
+
+if __name__ == "__main__":
+    main()
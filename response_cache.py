@@ -0,0 +1,148 @@
+import hashlib
+import logging
+import sqlite3
+import time
+import zlib
+from url_index import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = "response_cache.db"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Eviction trims the cache to this fraction of max_bytes so it does not run on every store
+_EVICT_TARGET = 0.9
+
+class ResponseCache:
+    """Persistent SQLite cache of fetched pages keyed by canonical URL.
+
+    Bodies are stored zlib-compressed next to their SHA-256, ETag and
+    Last-Modified. conditional_headers() turns a cached entry into
+    If-None-Match / If-Modified-Since headers so unchanged pages come back as
+    a 304 and are served from disk. The compressed size of all bodies is
+    bounded by max_bytes, evicting the least recently used entries. In
+    offline mode callers serve only what is already cached.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = DEFAULT_MAX_BYTES,
+                 offline: bool = False):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.hits = 0
+        self.revalidated = 0
+        self.unchanged = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                final_url TEXT NOT NULL,
+                status INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                body BLOB NOT NULL,
+                body_hash TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+        self.conn.commit()
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, url: str):
+        """Return the cached entry for url as a dict, or None"""
+        row = self.conn.execute(
+            "SELECT final_url, status, etag, last_modified, body, body_hash, fetched_at "
+            "FROM responses WHERE url = ?",
+            (canonicalize_url(url),)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        final_url, status, etag, last_modified, body, body_hash, fetched_at = row
+        return {
+            'final_url': final_url, 'status': status, 'etag': etag,
+            'last_modified': last_modified, 'text': zlib.decompress(body).decode('utf-8'),
+            'body_hash': body_hash, 'fetched_at': fetched_at
+        }
+
+    @staticmethod
+    def conditional_headers(entry) -> dict:
+        """Validators to send when revalidating a cached entry"""
+        headers = {}
+        if entry and entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def serve(self, url: str, entry, revalidated: bool = False) -> str:
+        """Mark a cached entry as used and return its text"""
+        self.hits += 1
+        if revalidated:
+            self.revalidated += 1
+        try:
+            with self.conn:
+                self.conn.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE url = ?",
+                    (time.time(), canonicalize_url(url))
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Error updating response cache {self.path}: {str(e)}")
+        return entry['text']
+
+    def store(self, url: str, final_url: str, status: int, text: str, etag: str = None,
+              last_modified: str = None, previous=None):
+        """Save a fetched page, evicting old entries if the cache grows past max_bytes"""
+        data = text.encode('utf-8')
+        body_hash = hashlib.sha256(data).hexdigest()
+        if previous is not None and previous['body_hash'] == body_hash:
+            # Server did not revalidate but the page is unchanged
+            self.unchanged += 1
+        key = canonicalize_url(url)
+        body = zlib.compress(data)
+        now = time.time()
+        try:
+            with self.conn:
+                old = self.conn.execute("SELECT size FROM responses WHERE url = ?", (key,)).fetchone()
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO responses "
+                    "(url, final_url, status, etag, last_modified, body, body_hash, size, fetched_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, final_url, status, etag, last_modified, body, body_hash, len(body), now, now)
+                )
+            self.total_bytes += len(body) - (old[0] if old else 0)
+        except sqlite3.Error as e:
+            logger.error(f"Error writing response cache {self.path}: {str(e)}")
+            return
+        if self.total_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Drop least recently used entries until the cache is back under its size bound"""
+        target = self.max_bytes * _EVICT_TARGET
+        rows = self.conn.execute("SELECT url, size FROM responses ORDER BY accessed_at")
+        doomed = []
+        for url, size in rows:
+            if self.total_bytes <= target:
+                break
+            doomed.append((url,))
+            self.total_bytes -= size
+        try:
+            with self.conn:
+                self.conn.executemany("DELETE FROM responses WHERE url = ?", doomed)
+        except sqlite3.Error as e:
+            logger.error(f"Error evicting from response cache {self.path}: {str(e)}")
+        logger.info(f"Evicted {len(doomed)} cached responses")
+
+    def summary(self) -> str:
+        return (f"{self.hits} served from cache ({self.revalidated} revalidated with 304), "
+                f"{self.unchanged} unchanged re-downloads, {self.misses} misses, "
+                f"{self.total_bytes / (1024 * 1024):.1f} MiB on disk")
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,112 @@
+import asyncio
+import logging
+import time
+import urllib.robotparser
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+class RobotsCache:
+    """robots.txt compliance layer with an LRU cache of parsed rules.
+
+    `fetch` is an async callable taking a robots.txt URL and returning
+    (status_code, text). Each host's robots.txt is fetched once per TTL,
+    concurrent lookups for the same host share one fetch, and answers for
+    cached hosts come straight from the parsed rules. Following RFC 9309, a
+    4xx response allows everything while a 5xx or network error disallows
+    the host until error_ttl expires.
+    """
+
+    def __init__(self, fetch, user_agent: str = '*', max_hosts: int = 10000,
+                 ttl: float = 24 * 3600, error_ttl: float = 3600):
+        self.fetch = fetch
+        self.user_agent = user_agent
+        self.max_hosts = max_hosts
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self._rules = OrderedDict()
+        self._in_flight = {}
+        self.fetches = 0
+        self.denied = 0
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parsed = urlparse(url)
+        return f"{parsed.scheme}://{parsed.netloc}".lower()
+
+    async def _load(self, origin: str):
+        parser = urllib.robotparser.RobotFileParser()
+        ttl = self.ttl
+        self.fetches += 1
+        try:
+            status, text = await self.fetch(f"{origin}/robots.txt")
+            if status >= 500:
+                parser.disallow_all = True
+                ttl = self.error_ttl
+            elif status >= 400:
+                parser.allow_all = True
+            else:
+                parser.parse(text.splitlines())
+        except Exception as e:
+            logger.debug(f"Could not fetch robots.txt for {origin}: {str(e)}")
+            parser.disallow_all = True
+            ttl = self.error_ttl
+        return parser, time.monotonic() + ttl
+
+    async def rules(self, url: str) -> urllib.robotparser.RobotFileParser:
+        """Return the parsed robots.txt rules for url's host"""
+        origin = self._origin(url)
+        entry = self._rules.get(origin)
+        if entry is not None and entry[1] > time.monotonic():
+            self._rules.move_to_end(origin)
+            return entry[0]
+
+        future = self._in_flight.get(origin)
+        if future is None:
+            future = asyncio.ensure_future(self._load(origin))
+            self._in_flight[origin] = future
+            try:
+                entry = await future
+            finally:
+                del self._in_flight[origin]
+            self._rules[origin] = entry
+            self._rules.move_to_end(origin)
+            while len(self._rules) > self.max_hosts:
+                self._rules.popitem(last=False)
+            return entry[0]
+        return (await asyncio.shield(future))[0]
+
+    async def allowed(self, url: str) -> bool:
+        """Check whether robots.txt lets us fetch url"""
+        is_allowed = (await self.rules(url)).can_fetch(self.user_agent, url)
+        if not is_allowed:
+            self.denied += 1
+        return is_allowed
+
+    async def crawl_delay(self, url: str):
+        """Return the Crawl-delay for url's host, or None"""
+        return (await self.rules(url)).crawl_delay(self.user_agent)
+
+    async def filter_allowed(self, urls) -> list:
+        """Drop urls disallowed by robots.txt, keeping the order of the rest"""
+        urls = list(urls)
+        verdicts = await asyncio.gather(*(self.allowed(url) for url in urls))
+        return [url for url, is_allowed in zip(urls, verdicts) if is_allowed]
+
+def httpx_fetcher(client, timeout: float = 10):
+    """Build a robots.txt fetcher on top of an httpx.AsyncClient"""
+    async def fetch(url):
+        response = await client.get(url, timeout=timeout)
+        return response.status_code, response.text
+    return fetch
+
+def playwright_fetcher(request_context, timeout: float = 10000):
+    """Build a robots.txt fetcher on top of a Playwright APIRequestContext"""
+    async def fetch(url):
+        response = await request_context.get(url, timeout=timeout)
+        try:
+            return response.status, await response.text()
+        finally:
+            await response.dispose()
+    return fetch
@@ -0,0 +1,159 @@
+import argparse
+import logging
+import os
+from datetime import datetime
+from navigation_policy import NavigationPolicy
+from tab_pool import TabPool
+from browser_pool import BrowserPool, add_browser_arguments
+from records import RecordWriter, make_record
+from seen_sets import new_seen_set, memory_report, add_seen_set_arguments
+from email_index import EmailIndex, open_email_index
+from pipeline import ValidationPipeline, add_pipeline_arguments, create_pipeline
+
+logger = logging.getLogger(__name__)
+
+class BrowserScraper:
+    """Browser lifecycle and result recording shared by the Playwright scrapers.
+
+    Subclasses set `engine` (recorded with each email) and `source` (used in
+    output file names), implement scrape_pages() and may override
+    prepare_page() to set up the search tab.
+    """
+
+    engine = None
+    source = None
+
+    def __init__(self, browser_pool: BrowserPool = None, sink: ValidationPipeline = None,
+                 email_index: EmailIndex = None, compact_seen: bool = False, memory_budget: int = None):
+        self.results = new_seen_set(compact_seen)  # emails found so far, hashed when compact_seen
+        self.browser_pool = browser_pool  # shared BrowserPool; a private one is started if None
+        self.sink = sink  # emails are validated as they are found when a pipeline is given
+        self.output_file = None
+        self.writer = None  # records are appended as soon as they are found
+        self.memory_budget = memory_budget
+        self.email_index = email_index  # cross-run index of every address seen
+        self.query = None
+        self._owns_pool = False
+        self.pooled_context = None
+        self.context = None
+        self.page = None
+        self.tab_pool = None
+        self.max_pages = 3
+        self.max_retries = 3
+        self.delay_range = (2, 4)  # seconds between requests
+        self.extraction_mode = 'dom'  # 'dom' matches inside the page, 'content' pulls the HTML
+        self.navigation_policy = NavigationPolicy()  # blocks heavy resources, extracts on DOM ready
+        self.max_tabs = 5  # result links visited concurrently
+        self.per_host_tabs = 2  # concurrent visits to a single host
+
+        # Ensure output directory exists
+        self.output_dir = "pre-validated_lists"
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    async def init_browser(self):
+        """Borrow a browser context from the pool and open the search tab"""
+        if self.browser_pool is None:
+            # No shared pool given; run a private one for this scrape
+            self.browser_pool = BrowserPool(navigation_policy=self.navigation_policy)
+            self._owns_pool = True
+        else:
+            self.navigation_policy = self.browser_pool.navigation_policy
+        self.pooled_context = await self.browser_pool.acquire()
+        self.context = self.pooled_context.context
+
+        self.page = await self.context.new_page()
+        self.tab_pool = TabPool(self.context, size=self.max_tabs, per_host_limit=self.per_host_tabs)
+        await self.prepare_page()
+
+    async def prepare_page(self):
+        """Hook for engine-specific cookies and scripts, run once the search tab is open"""
+
+    async def close_browser(self):
+        """Return the borrowed context to the pool, shutting down a private pool"""
+        if self.tab_pool is not None:
+            await self.tab_pool.close()
+            self.tab_pool = None
+        if self.pooled_context is not None:
+            await self.browser_pool.release(self.pooled_context)
+            self.pooled_context = None
+        if self._owns_pool:
+            await self.browser_pool.close()
+            self.browser_pool = None
+            self._owns_pool = False
+
+    async def record_emails(self, link, emails, engine: str = None):
+        """Write newly found emails with where they were found, or hand them to the pipeline"""
+        records = [make_record(email, link, engine or self.engine, self.query) for email in emails]
+        if self.email_index is not None:
+            self.email_index.record_seen(records)
+        new_records = [record for record in records if record['email'] not in self.results]
+        for record in new_records:
+            self.results.add(record['email'])
+        if self.sink is not None:
+            await self.sink.submit_many(new_records)
+        elif new_records:
+            if self.writer is None:
+                self.writer = RecordWriter(self.output_file)
+            self.writer.write_many(new_records)
+
+    async def scrape_pages(self, query: str):
+        """Visit the engine's result pages for query, recording emails as they are found"""
+        raise NotImplementedError
+
+    async def scrape_emails(self, query: str):
+        """Main scraping function"""
+        logger.info(f"Starting email scraping for query: {query}")
+        self.query = query
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.output_file = os.path.join(self.output_dir, f"emails_{self.source}_{timestamp}.jsonl")
+
+        try:
+            await self.init_browser()
+            await self.scrape_pages(query)
+
+            # Results were written as they were found
+            logger.info(f"Memory: {memory_report(self.memory_budget, emails=self.results)}")
+            if self.sink is not None:
+                logger.info(f"{len(self.results)} emails streamed to {self.sink.output_file}")
+            elif len(self.results):
+                logger.info(f"Emails saved to {self.output_file}")
+            else:
+                logger.warning("No emails found. Try a different search query.")
+
+        except Exception as e:
+            logger.error(f"Error during scraping: {str(e)}")
+
+        finally:
+            if self.writer is not None:
+                self.writer.close()
+                self.writer = None
+            await self.close_browser()
+
+async def run_scraper(scraper_class):
+    """Command line entry point: scrape each ';'-separated query with one shared browser"""
+    parser = argparse.ArgumentParser(description='Scrape business emails')
+    add_pipeline_arguments(parser)
+    add_seen_set_arguments(parser)
+    add_browser_arguments(parser)
+    args = parser.parse_args()
+
+    queries = input("Enter your search query (e.g. dentists in Dubai; separate several with ';'): ")
+    email_index = open_email_index(args)
+    pipeline = create_pipeline(args, scraper_class.source, email_index)
+    # One browser for the whole batch
+    async with BrowserPool(headless=not args.headed) as browser_pool:
+        if pipeline is not None:
+            await pipeline.start()
+        try:
+            for query in filter(None, (q.strip() for q in queries.split(';'))):
+                scraper = scraper_class(
+                    browser_pool=browser_pool, sink=pipeline, email_index=email_index,
+                    compact_seen=args.compact_seen,
+                    memory_budget=args.memory_budget_mb * 1024 * 1024 if args.memory_budget_mb else None
+                )
+                await scraper.scrape_emails(query)
+        finally:
+            if pipeline is not None:
+                await pipeline.close()
+            if email_index is not None:
+                email_index.close()
@@ -1,13 +1,24 @@
-import httpx, re, asyncio, urllib.parse
-from bs4 import BeautifulSoup
+import httpx, asyncio, urllib.parse
 from urllib.parse import urlparse
 import random
 from datetime import datetime
 import aiohttp
 import json
+import argparse
 from fake_useragent import UserAgent
-
-EMAIL_REGEX = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
+import codecs
+from email_extractor import StreamingEmailExtractor
+from politeness import HostScheduler
+from robots import RobotsCache, httpx_fetcher
+from url_index import CanonicalURLIndex
+from frontier import Frontier
+from contact_discovery import ContactDiscovery
+from parse_pool import ParsePool, extract_links
+from link_extractors import LINK_EXTRACTORS
+from email_index import EmailIndex, add_email_index_arguments, open_email_index
+from records import RecordWriter, make_record
+from seen_sets import new_seen_set, new_url_seen_set, memory_report, add_seen_set_arguments
+from response_cache import ResponseCache, DEFAULT_CACHE_PATH
 
 PROXY_LIST = [
     # HTTPS proxies from spys.one
@@ -44,7 +55,8 @@ def get_random_headers():
         "DNT": "1"
     }
 
-# Common business directories and contact pages
+# Common business directories and contact pages; these start out ranked
+# above other links and the frontier adjusts them from what they yield
 BUSINESS_DIRECTORIES = [
     "yellowpages.com",
     "yell.com",
@@ -142,10 +154,182 @@ search_engines = {
     }
 }
 
-async def fetch_page(client, url, search_engine):
+# Bodies larger than this are cut off; result pages are read in chunks of READ_CHUNK_SIZE
+DEFAULT_MAX_BODY_BYTES = 2 * 1024 * 1024
+READ_CHUNK_SIZE = 64 * 1024
+
+# Content types worth reading; anything else (PDFs, images, archives) is skipped
+TEXT_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain", "application/xml", "text/xml")
+
+def create_scheduler(robots):
+    """Build the per-host politeness scheduler, using each engine's delay for its own host"""
+    scheduler = HostScheduler(crawl_delay_lookup=robots.crawl_delay)
+    for engine_config in search_engines.values():
+        low, high = engine_config["delay"]
+        scheduler.set_min_delay(urlparse(engine_config["url"]).hostname, low, jitter=high - low)
+    return scheduler
+
+class ScrapeRun:
+    """State shared by every request of one scrape_emails run"""
+
+    def __init__(self, client, output_file: str, cache: ResponseCache = None, email_index: EmailIndex = None,
+                 compact_seen: bool = False, url_error_rate: float = 0.001, memory_budget: int = None,
+                 max_body_bytes: int = DEFAULT_MAX_BODY_BYTES, parse_pool: ParsePool = None,
+                 link_backend: str = 'auto', contact_budget: int = 3):
+        self.client = client
+        self.robots = RobotsCache(httpx_fetcher(client))
+        self.scheduler = create_scheduler(self.robots)
+        # Canonical URLs already fetched, across all queries and engines;
+        # a Bloom filter keeps this bounded on very large crawls
+        self.url_index = CanonicalURLIndex(new_url_seen_set(compact_seen, url_error_rate))
+        # Links waiting to be fetched, best expected yield first
+        self.frontier = Frontier(BUSINESS_DIRECTORIES)
+        # Contact pages tried on result domains that show no address of their own
+        self.discovery = ContactDiscovery(BUSINESS_DIRECTORIES, budget=contact_budget)
+        # Optional on-disk response cache shared with later runs
+        self.cache = cache
+        # Emails found so far; their records are written out as they are found
+        self.emails_seen = new_seen_set(compact_seen)
+        self.output_file = output_file
+        self.writer = None
+        # Optional cross-run index of every address seen
+        self.email_index = email_index
+        self.offline = cache is not None and cache.offline
+        self.memory_budget = memory_budget
+        self.max_body_bytes = max_body_bytes
+        # Optional worker processes for parsing; None parses on the event loop
+        self.parse_pool = parse_pool
+        self.link_backend = link_backend
+
+    def record_email(self, record: dict) -> bool:
+        """Append a newly found email to the output file; False if it was already found"""
+        if self.email_index is not None:
+            self.email_index.record_seen([record])
+        if record['email'] in self.emails_seen:
+            return False
+        self.emails_seen.add(record['email'])
+        if self.writer is None:
+            self.writer = RecordWriter(self.output_file)
+        self.writer.write(record)
+        return True
+
+    def memory_report(self) -> str:
+        return memory_report(self.memory_budget, urls=self.url_index, emails=self.emails_seen)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        if self.parse_pool is not None:
+            self.parse_pool.close()
+
+def serve_cached(run, url, cached, extractor=None, revalidated=False):
+    """Return a cached page, feeding it to the extractor like a fetched one"""
+    run.url_index.record_redirect(url, cached['final_url'])
+    text = run.cache.serve(url, cached, revalidated=revalidated)
+    if extractor is not None:
+        extractor.feed(text)
+    return text
+
+async def read_body(response, max_bytes, extractor=None, keep_body=True):
+    """Stream a response body in chunks.
+
+    Chunks are decoded incrementally, checked for a captcha (with an overlap
+    so the word is caught across chunk boundaries) and fed to the extractor.
+    Returns (text, blocked, truncated); text is '' unless keep_body is set.
+    """
+    decoder = codecs.getincrementaldecoder(response.charset_encoding or "utf-8")(errors="replace")
+    parts = []
+    tail = ""
+    received = 0
+    truncated = False
+    async for raw in response.aiter_bytes(READ_CHUNK_SIZE):
+        if received + len(raw) > max_bytes:
+            raw = raw[:max_bytes - received]
+            truncated = True
+        received += len(raw)
+        chunk = decoder.decode(raw, final=truncated)
+        window = (tail + chunk).lower()
+        if "captcha" in window:
+            return None, True, truncated
+        tail = window[-6:]
+        if extractor is not None:
+            extractor.feed(chunk)
+        if keep_body:
+            parts.append(chunk)
+        if truncated:
+            break
+    if not truncated:
+        chunk = decoder.decode(b"", final=True)
+        if extractor is not None:
+            extractor.feed(chunk)
+        if keep_body:
+            parts.append(chunk)
+    return "".join(parts), False, truncated
+
+async def read_response(run, url, response, search_engine, cached=None, extractor=None):
+    """Return the page text for a streamed response, or None if it is blocked or not a page.
+
+    With an extractor the body is only kept when it has to go into the cache,
+    so memory per request is bounded by the chunk size.
+    """
+    # Unchanged since the cached copy
+    if response.status_code == 304 and cached is not None:
+        return serve_cached(run, url, cached, extractor, revalidated=True)
+    
+    # Check if we're being blocked
+    if response.status_code == 429:
+        print(f"[-] Rate limited or captcha detected on {search_engine}")
+        return None
+    
+    # Skip binary downloads before reading any of the body
+    content_type = response.headers.get("content-type", "").lower()
+    if content_type and not content_type.startswith(TEXT_CONTENT_TYPES):
+        print(f"[-] Skipping {url}: not a page ({content_type.split(';')[0]})")
+        return None
+    
+    cacheable = run.cache is not None and response.status_code == 200
+    if extractor is not None:
+        extractor.reset()
+    text, blocked, truncated = await read_body(
+        response, run.max_body_bytes, extractor, keep_body=extractor is None or cacheable
+    )
+    if blocked:
+        print(f"[-] Rate limited or captcha detected on {search_engine}")
+        return None
+    if truncated:
+        print(f"[*] Read only the first {run.max_body_bytes // 1024} KiB of {url}")
+    
+    final_url = str(response.url)
+    run.url_index.record_redirect(url, final_url)
+    if cacheable and not truncated:
+        run.cache.store(
+            url, final_url, response.status_code, text,
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+            previous=cached
+        )
+    return text
+
+async def fetch_page(run, url, search_engine, check_robots=False, extractor=None):
+    """Fetch url, returning its text or None on failure.
+
+    When an extractor is given the body is streamed into it and the text
+    returned is empty unless the page is kept in the response cache.
+    """
+    client = run.client
     try:
-        # Add random delay between requests
-        await asyncio.sleep(random.uniform(*search_engines[search_engine]["delay"]))
+        cached = run.cache.get(url) if run.cache is not None else None
+        if run.offline:
+            # Replay mode: never touch the network
+            if cached is None:
+                return None
+            return serve_cached(run, url, cached, extractor)
+        
+        # Search result pages are checked against robots.txt; search engine
+        # queries themselves are fetched without a robots check
+        if check_robots and not await run.robots.allowed(url):
+            print(f"[-] Skipping {url}: disallowed by robots.txt")
+            return None
         
         # Use different headers for each request
         headers = search_engines[search_engine]["headers"].copy()
@@ -161,6 +345,10 @@ async def fetch_page(client, url, search_engine):
         elif "duckduckgo" in search_engine.lower():
             headers["Referer"] = "https://duckduckgo.com/"
         
+        # Revalidate cached pages instead of downloading them again
+        if cached is not None:
+            headers.update(ResponseCache.conditional_headers(cached))
+        
         # Try with proxy first
         proxy = get_random_proxy()
         if proxy:
@@ -174,93 +362,124 @@ async def fetch_page(client, url, search_engine):
                 # Remove None values
                 client.proxies = {k: v for k, v in client.proxies.items() if v is not None}
                 
-                response = await client.get(url, headers=headers, timeout=30)
+                async with run.scheduler.slot(url):
+                    async with client.stream("GET", url, headers=headers, timeout=30) as response:
+                        text = await read_response(run, url, response, search_engine, cached, extractor)
                 
-                # Check if we're being blocked
-                if response.status_code == 429 or "captcha" in response.text.lower():
-                    print(f"[-] Rate limited or captcha detected on {search_engine}")
+                if text is None:
                     # Clear proxy and try direct connection
                     client.proxies = None
-                    return None
-                    
-                return response.text
+                return text
             except Exception as e:
                 print(f"[-] Proxy {proxy} failed: {str(e)}")
                 client.proxies = None
         
         # If proxy fails or no proxy available, try direct connection
         print("[*] Trying direct connection")
-        response = await client.get(url, headers=headers, timeout=30)
-        
-        # Check if we're being blocked
-        if response.status_code == 429 or "captcha" in response.text.lower():
-            print(f"[-] Rate limited or captcha detected on {search_engine}")
-            return None
-            
-        return response.text
+        async with run.scheduler.slot(url):
+            async with client.stream("GET", url, headers=headers, timeout=30) as response:
+                return await read_response(run, url, response, search_engine, cached, extractor)
     except Exception as e:
         print(f"[-] Error fetching {url}: {str(e)}")
         return None
 
-async def extract_emails_from_page(client, url, search_engine):
+async def extract_emails_from_page(run, url, search_engine, query):
+    """Fetch url and record its emails; None if the page was not fetched"""
     try:
-        content = await fetch_page(client, url, search_engine)
-        if not content:
-            return set()
-        
-        emails = set()
-        found_emails = re.findall(EMAIL_REGEX, content)
+        if run.parse_pool is not None:
+            # The capped body is matched in a worker process
+            content = await fetch_page(run, url, search_engine, check_robots=True)
+            if content is None:
+                return None
+            emails = await run.parse_pool.emails(content)
+        else:
+            # Emails are matched chunk by chunk while the body streams in
+            extractor = StreamingEmailExtractor()
+            content = await fetch_page(run, url, search_engine, check_robots=True, extractor=extractor)
+            if content is None:
+                return None
+            emails = extractor.finish()
         
-        for email in found_emails:
-            email = email.lower()
-            if not email.endswith(('.png', '.jpg', '.jpeg', '.svg', '.gif', '.webp')):
-                emails.add(email)
-                print(f"[+] Found email: {email}")
-                print(f"    Source: {url}")
-                print(f"    Search Engine: {search_engine}")
-                print(f"    Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-                print("    " + "-" * 50)
+        for email in emails:
+            run.record_email(make_record(email, url, search_engine, query))
+            print(f"[+] Found email: {email}")
+            print(f"    Source: {url}")
+            print(f"    Search Engine: {search_engine}")
+            print(f"    Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+            print("    " + "-" * 50)
         
         return emails
     except Exception as e:
         print(f"[-] Error processing {url}: {str(e)}")
         return set()
 
-async def process_search_results(client, search_url, page_num, search_engine):
+async def fetch_ranked_page(run, url, search_engine, query):
+    """Fetch a link taken from the frontier and feed its yield back into the scores.
+
+    Returns None, and leaves the scores alone, if the page was not fetched.
+    """
+    emails = await extract_emails_from_page(run, url, search_engine, query)
+    if emails is None:
+        run.frontier.discard(url)
+    else:
+        run.frontier.record(url, len(emails))
+    return emails
+
+async def visit_result(run, url, search_engine, query):
+    """Fetch a result page, then look for contact pages on its domain if it had no address of its own"""
+    emails = await fetch_ranked_page(run, url, search_engine, query)
+    if emails is None:
+        # Disallowed, failed or not HTML; the site is not worth exploring
+        return set()
+
+    async def fetch_contact_page(link):
+        if not is_valid_url(link) or not run.url_index.claim(link):
+            return None
+        return await fetch_ranked_page(run, link, search_engine, query)
+
+    found = await run.discovery.explore(url, emails, fetch_contact_page)
+    return emails | found
+
+async def process_search_results(run, search_url, page_num, search_engine, query):
     try:
         url = search_url.format(page_num * 10)
         print(f"\n[*] Searching on {search_engine} - Page {page_num + 1}")
-        content = await fetch_page(client, url, search_engine)
+        content = await fetch_page(run, url, search_engine)
         if not content:
             return set()
         
-        soup = BeautifulSoup(content, "html.parser")
-        links = set()
-        
-        # Extract all links
-        for a in soup.find_all("a", href=True):
-            href = a['href']
-            if href.startswith("http") and is_valid_url(href):
-                links.add(href)
+        # Extract all links, off the event loop when a parse pool is running
+        if run.parse_pool is not None:
+            links = await run.parse_pool.links(content)
+        else:
+            links = extract_links(content, run.link_backend)
         
-        # Prioritize business directory and contact pages
-        prioritized_links = []
-        other_links = []
+        # Drop links robots.txt disallows (replayed runs only contain pages
+        # that were allowed when fetched)
+        if not run.offline:
+            links = await run.robots.filter_allowed(links)
         
+        # Queue the links with those from every other results page; the best
+        # scoring ones are fetched whichever page they came from
         for link in links:
-            if any(dir in link.lower() for dir in BUSINESS_DIRECTORIES):
-                prioritized_links.append(link)
-            else:
-                other_links.append(link)
+            if link in run.url_index or not run.frontier.push(link, (search_engine, query)):
+                # Already fetched, or already waiting in the frontier
+                run.url_index.note_duplicate()
         
-        # Process prioritized links first
-        all_links = prioritized_links + other_links
-        
-        # Process links in parallel
+        # Process links in parallel; the scheduler spaces out requests per host
         tasks = []
-        for link in all_links[:20]:  # Limit to 20 links per page to avoid overwhelming
-            tasks.append(extract_emails_from_page(client, link, search_engine))
-            await asyncio.sleep(random.uniform(1, 3))  # Random delay between requests
+        while len(tasks) < 20:  # Limit to 20 links per page to avoid overwhelming
+            entry = run.frontier.pop()
+            if entry is None:
+                break
+            # Skip pages already fetched by any query or engine in this run,
+            # and sites that already gave an address of their own;
+            # records keep the engine and query the link was found through
+            link, (link_engine, link_query) = entry
+            if run.discovery.is_done(link) or not run.url_index.claim(link):
+                run.frontier.discard(link)
+                continue
+            tasks.append(visit_result(run, link, link_engine, link_query))
         
         results = await asyncio.gather(*tasks)
         return set().union(*results)
@@ -269,8 +488,11 @@ async def process_search_results(client, search_url, page_num, search_engine):
         print(f"[-] Error processing search results: {str(e)}")
         return set()
 
-async def scrape_emails(query: str, max_pages: int = 3):
-    results = set()
+async def scrape_emails(query: str, max_pages: int = 3, cache: ResponseCache = None,
+                        email_index: EmailIndex = None, compact_seen: bool = False,
+                        url_error_rate: float = 0.001, memory_budget: int = None,
+                        max_body_bytes: int = DEFAULT_MAX_BODY_BYTES, parse_workers: int = 0,
+                        link_backend: str = 'auto', contact_budget: int = 3):
     formatted_queries = format_search_query(query)
     
     print(f"\n[*] Starting email scraping for query: {query}")
@@ -285,51 +507,95 @@ async def scrape_emails(query: str, max_pages: int = 3):
         verify=True,
         http2=True
     ) as client:
-        for formatted_query in formatted_queries:
-            encoded_query = urllib.parse.quote(formatted_query)
-            print(f"\n[*] Processing query: {formatted_query}")
+        # Records are appended to the output file as soon as they are found
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        run = ScrapeRun(
+            client, f"emails_{timestamp}.jsonl", cache, email_index,
+            compact_seen=compact_seen, url_error_rate=url_error_rate, memory_budget=memory_budget,
+            max_body_bytes=max_body_bytes,
+            parse_pool=ParsePool(parse_workers, link_backend=link_backend) if parse_workers > 0 else None,
+            link_backend=link_backend, contact_budget=contact_budget
+        )
+        if run.offline:
+            print(f"[*] Offline replay from {cache.path}: no network requests will be made")
+        
+        try:
+            for formatted_query in formatted_queries:
+                encoded_query = urllib.parse.quote(formatted_query)
+                print(f"\n[*] Processing query: {formatted_query}")
             
-            for engine_name, engine_config in search_engines.items():
-                search_url = engine_config["url"].format(encoded_query, "{}")
-                
-                # Process pages in parallel
+                # Query every engine and page at once; the scheduler applies
+                # each engine's delay to its own host only
                 tasks = []
-                for i in range(max_pages):
-                    tasks.append(process_search_results(client, search_url, i, engine_name))
-                    # Use engine-specific delays
-                    await asyncio.sleep(random.uniform(*engine_config["delay"]))
-                
-                page_results = await asyncio.gather(*tasks)
-                for page_emails in page_results:
-                    results.update(page_emails)
-                
-                print(f"[+] Found {len(results)} unique emails so far...")
-                
-                # Random delay between search engines
-                await asyncio.sleep(random.uniform(8, 15))
+                for engine_name, engine_config in search_engines.items():
+                    search_url = engine_config["url"].format(encoded_query, "{}")
+                    for i in range(max_pages):
+                        tasks.append(process_search_results(run, search_url, i, engine_name, formatted_query))
+            
+                await asyncio.gather(*tasks)
+            
+                print(f"[+] Found {len(run.emails_seen)} unique emails so far...")
+                print(f"[*] Memory: {run.memory_report()}")
 
-    print(f"\n[+] Total unique emails found: {len(results)}")
+            print(f"[*] URL dedup: {run.url_index.summary()}")
+            print(f"[*] Frontier: {run.frontier.summary()}")
+            print(f"[*] Contact discovery: {run.discovery.summary()}")
+            if cache is not None:
+                print(f"[*] Response cache: {cache.summary()}")
+            if run.parse_pool is not None:
+                print(f"[*] Parse pool: {run.parse_pool.summary()}")
+        finally:
+            run.close()
 
-    # Save to text file with detailed information
-    if results:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"emails_{timestamp}.txt"
-        with open(filename, "w", encoding="utf-8") as f:
-            f.write(f"Email Scraping Results\n")
-            f.write(f"Query: {query}\n")
-            f.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Total Emails Found: {len(results)}\n")
-            f.write("=" * 50 + "\n\n")
-            
-            for email in sorted(results):
-                f.write(f"Email: {email}\n")
-                f.write("-" * 30 + "\n")
-        
-        print(f"[✓] Emails saved to {filename}")
+    print(f"\n[+] Total unique emails found: {len(run.emails_seen)}")
+
+    if len(run.emails_seen):
+        print(f"[✓] Emails saved to {run.output_file}")
     else:
         print("[-] No emails found. Try a different search query.")
 
 # Run it
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Scrape business emails from search engine results')
+    parser.add_argument('--cache', nargs='?', const=DEFAULT_CACHE_PATH, default=None, metavar='PATH',
+                        help=f'Keep fetched pages in an on-disk response cache (default path: {DEFAULT_CACHE_PATH})')
+    parser.add_argument('--cache-max-mb', type=int, default=256,
+                        help='Size bound of the response cache in MiB (default: 256)')
+    parser.add_argument('--offline', action='store_true',
+                        help='Replay a previous run from the response cache without any network access')
+    parser.add_argument('--max-page-kb', type=int, default=DEFAULT_MAX_BODY_BYTES // 1024,
+                        help='Stop reading a page after this many KiB (default: 2048)')
+    parser.add_argument('--parse-workers', type=int, default=0,
+                        help='Worker processes for HTML parsing and email extraction (default: 0, parse on the event loop)')
+    # Only offer the backends whose parser is installed
+    parser.add_argument('--link-backend', choices=['auto', *LINK_EXTRACTORS], default='auto',
+                        help='Parser used to pull links out of search result pages (default: fastest installed)')
+    parser.add_argument('--contact-budget', type=int, default=3,
+                        help='Contact/about/team pages to try per result domain with no address of its own (default: 3, 0 disables)')
+    add_email_index_arguments(parser)
+    add_seen_set_arguments(parser)
+    args = parser.parse_args()
+
+    cache = None
+    if args.cache or args.offline:
+        cache = ResponseCache(args.cache or DEFAULT_CACHE_PATH, max_bytes=args.cache_max_mb * 1024 * 1024,
+                              offline=args.offline)
+
+    email_index = open_email_index(args)
+
     query = input("Enter your search query (e.g. dentists in Dubai): ")
-    asyncio.run(scrape_emails(query))
+    try:
+        asyncio.run(scrape_emails(
+            query, cache=cache, email_index=email_index, compact_seen=args.compact_seen,
+            url_error_rate=args.url_error_rate,
+            memory_budget=args.memory_budget_mb * 1024 * 1024 if args.memory_budget_mb else None,
+            max_body_bytes=args.max_page_kb * 1024,
+            parse_workers=args.parse_workers,
+            link_backend=args.link_backend,
+            contact_budget=args.contact_budget
+        ))
+    finally:
+        if cache is not None:
+            cache.close()
+        if email_index is not None:
+            email_index.close()
@@ -0,0 +1,199 @@
+import argparse
+import hashlib
+import math
+import sys
+from array import array
+
+def _digest(item: str, size: int) -> bytes:
+    return hashlib.blake2b(item.encode('utf-8'), digest_size=size).digest()
+
+class BloomFilter:
+    """Fixed-capacity Bloom filter over strings"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        # Double hashing: k positions from two independent 64-bit halves
+        digest = _digest(item, 16)
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def __contains__(self, item: str) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def add(self, item: str) -> bool:
+        """Add item, returning False if it was (probably) already present"""
+        bits = self.bits
+        added = False
+        for pos in self._positions(item):
+            mask = 1 << (pos & 7)
+            if not bits[pos >> 3] & mask:
+                bits[pos >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __len__(self):
+        return self.count
+
+    def memory_bytes(self) -> int:
+        return sys.getsizeof(self.bits)
+
+class ScalableBloomFilter:
+    """Bloom filter that grows by adding filters as it fills up.
+
+    Each new filter has `growth` times the capacity of the last and a
+    tighter error rate, so the overall false-positive rate stays below
+    error_rate no matter how many items are added. Memory grows roughly
+    linearly with the number of items at about -ln(p)/ln(2)^2 bits each
+    (~14 bits per URL at p=0.001), instead of storing the strings.
+    """
+
+    def __init__(self, initial_capacity: int = 100000, error_rate: float = 0.001,
+                 growth: int = 2, tightening: float = 0.5):
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.growth = growth
+        self.tightening = tightening
+        self.filters = []
+        self._add_filter()
+
+    def _add_filter(self):
+        stage = len(self.filters)
+        capacity = self.initial_capacity * self.growth ** stage
+        error_rate = self.error_rate * (1 - self.tightening) * self.tightening ** stage
+        self.filters.append(BloomFilter(capacity, error_rate))
+
+    def __contains__(self, item: str) -> bool:
+        return any(item in bloom for bloom in reversed(self.filters))
+
+    def add(self, item: str) -> bool:
+        """Add item, returning False if it was (probably) already present"""
+        if item in self:
+            return False
+        if self.filters[-1].count >= self.filters[-1].capacity:
+            self._add_filter()
+        return self.filters[-1].add(item)
+
+    def __len__(self):
+        return sum(bloom.count for bloom in self.filters)
+
+    def memory_bytes(self) -> int:
+        return sum(bloom.memory_bytes() for bloom in self.filters)
+
+class HashedSet:
+    """Exact-membership set storing 64-bit hashes instead of strings.
+
+    An open-addressing table in an array('Q') costs about 11-23 bytes per
+    item, against roughly 100 for a str in a set. Two different items are
+    only confused on a 64-bit hash collision.
+    """
+
+    _MAX_LOAD = 0.7
+
+    def __init__(self, capacity: int = 1024):
+        size = 8
+        while size * self._MAX_LOAD < capacity:
+            size *= 2
+        self._table = array('Q', bytes(8 * size))
+        self._mask = size - 1
+        self._count = 0
+
+    @staticmethod
+    def _hash(item: str) -> int:
+        # 0 marks an empty slot
+        return int.from_bytes(_digest(item, 8), 'little') or 1
+
+    def _slot(self, table, mask, value: int) -> int:
+        index = value & mask
+        while table[index] and table[index] != value:
+            index = (index + 1) & mask
+        return index
+
+    def __contains__(self, item: str) -> bool:
+        value = self._hash(item)
+        return self._table[self._slot(self._table, self._mask, value)] == value
+
+    def add(self, item: str) -> bool:
+        """Add item, returning False if it was already present"""
+        value = self._hash(item)
+        index = self._slot(self._table, self._mask, value)
+        if self._table[index] == value:
+            return False
+        self._table[index] = value
+        self._count += 1
+        if self._count > (self._mask + 1) * self._MAX_LOAD:
+            self._resize()
+        return True
+
+    def _resize(self):
+        old = self._table
+        size = (self._mask + 1) * 2
+        table = array('Q', bytes(8 * size))
+        mask = size - 1
+        for value in old:
+            if value:
+                table[self._slot(table, mask, value)] = value
+        self._table = table
+        self._mask = mask
+
+    def __len__(self):
+        return self._count
+
+    def memory_bytes(self) -> int:
+        return sys.getsizeof(self._table)
+
+def new_seen_set(compact: bool = False):
+    """Seen-set for emails: a plain set, or a HashedSet when compact"""
+    return HashedSet() if compact else set()
+
+def new_url_seen_set(compact: bool = False, error_rate: float = 0.001):
+    """Seen-set for URLs: a plain set, or a ScalableBloomFilter when compact"""
+    return ScalableBloomFilter(error_rate=error_rate) if compact else set()
+
+def memory_bytes(seen) -> int:
+    """Approximate memory held by a seen-set, including the strings of a plain set"""
+    if hasattr(seen, 'memory_bytes'):
+        return seen.memory_bytes()
+    return sys.getsizeof(seen) + sum(sys.getsizeof(item) for item in seen)
+
+def peak_rss_bytes():
+    """Peak resident set size of this process, or None where it is not available (Windows)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def memory_report(budget_bytes: int = None, **seen_sets) -> str:
+    """One-line summary of seen-set sizes and peak RSS, flagging an exceeded budget"""
+    parts = [
+        f"{name}: {len(seen)} items in {memory_bytes(seen) / (1024 * 1024):.1f} MiB"
+        for name, seen in seen_sets.items()
+    ]
+    peak = peak_rss_bytes()
+    if peak is not None:
+        parts.append(f"peak RSS {peak / (1024 * 1024):.0f} MiB")
+    if budget_bytes and peak is not None and peak > budget_bytes:
+        parts.append(f"OVER BUDGET of {budget_bytes / (1024 * 1024):.0f} MiB")
+    return ", ".join(parts)
+
+def add_seen_set_arguments(parser: argparse.ArgumentParser):
+    """Add the options selecting the seen-set backend to parser"""
+    parser.add_argument('--compact-seen', action='store_true',
+                        help='Track seen URLs in a Bloom filter and emails as 64-bit hashes to bound memory')
+    parser.add_argument('--url-error-rate', type=float, default=0.001,
+                        help='False-positive rate of the seen-URL Bloom filter with --compact-seen')
+    parser.add_argument('--memory-budget-mb', type=int, default=None,
+                        help='Warn in memory reports when peak RSS exceeds this')
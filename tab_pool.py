@@ -0,0 +1,81 @@
+import asyncio
+import logging
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+class TabPool:
+    """Reusable pool of pages (tabs) inside one browser context.
+
+    Links are visited concurrently, at most `size` at a time and at most
+    `per_host_limit` against any single host. Tabs that crash or get closed
+    are thrown away and replaced on the next visit.
+    """
+
+    def __init__(self, context, size: int = 5, per_host_limit: int = 2):
+        self.context = context
+        self.size = max(1, size)
+        self.per_host_limit = max(1, per_host_limit)
+        self._slots = asyncio.Semaphore(self.size)
+        self._idle = []
+        self._pages = set()
+        self._crashed = set()
+        self._host_semaphores = {}
+        self._closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = (urlparse(url).hostname or '').lower()
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_limit)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    async def _new_page(self):
+        page = await self.context.new_page()
+        page.on('crash', lambda crashed_page: self._crashed.add(crashed_page))
+        self._pages.add(page)
+        return page
+
+    async def _discard(self, page):
+        self._pages.discard(page)
+        self._crashed.discard(page)
+        try:
+            if not page.is_closed():
+                await page.close()
+        except Exception as e:
+            logger.debug(f"Error closing tab: {str(e)}")
+
+    async def run(self, url: str, visit):
+        """Run visit(page, url) on a pooled tab and return its result"""
+        if self._closed:
+            raise RuntimeError("TabPool is closed")
+        async with self._host_semaphore(url):
+            async with self._slots:
+                page = self._idle.pop() if self._idle else await self._new_page()
+                try:
+                    return await visit(page, url)
+                finally:
+                    if page in self._crashed or page.is_closed() or self._closed:
+                        logger.warning(f"Recycling tab after visiting {url}")
+                        await self._discard(page)
+                    else:
+                        self._idle.append(page)
+
+    async def map(self, urls, visit) -> list:
+        """Visit all urls concurrently; failures are returned as exceptions in place"""
+        return await asyncio.gather(*(self.run(url, visit) for url in urls), return_exceptions=True)
+
+    async def close(self):
+        """Close every tab owned by the pool"""
+        self._closed = True
+        pages = list(self._pages)
+        self._idle.clear()
+        for page in pages:
+            await self._discard(page)
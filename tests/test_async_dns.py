@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+dns = pytest.importorskip('dns')
+import dns.exception
+import dns.message
+import dns.rcode
+import dns.rdatatype
+import dns.resolver
+import dns.rrset
+
+from async_dns import AsyncDNSResolver
+
+RECORDS = {
+    ('example.test.', 'MX'): '10 mail.example.test.',
+    ('example.test.', 'A'): '192.0.2.1',
+}
+
+class StubDNSServer(asyncio.DatagramProtocol):
+    """UDP nameserver answering from RECORDS, NXDOMAIN for missing.test and silence for slow.test"""
+
+    def __init__(self):
+        self.queries = []
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        query = dns.message.from_wire(data)
+        question = query.question[0]
+        name = question.name.to_text()
+        rdtype = dns.rdatatype.to_text(question.rdtype)
+        self.queries.append((name, rdtype))
+        if name == 'slow.test.':
+            return
+        response = dns.message.make_response(query)
+        if (name, rdtype) in RECORDS:
+            response.answer.append(dns.rrset.from_text(name, 300, 'IN', rdtype, RECORDS[name, rdtype]))
+        else:
+            response.set_rcode(dns.rcode.NXDOMAIN)
+        self.transport.sendto(response.to_wire(), addr)
+
+async def with_stub_server(test):
+    loop = asyncio.get_running_loop()
+    transport, server = await loop.create_datagram_endpoint(StubDNSServer, local_addr=('127.0.0.1', 0))
+    port = transport.get_extra_info('sockname')[1]
+    resolver = AsyncDNSResolver(nameservers=['127.0.0.1'], port=port, timeout=0.2, lifetime=0.5)
+    try:
+        return await test(resolver, server)
+    finally:
+        transport.close()
+
+def test_answers_are_served_from_cache():
+    async def test(resolver, server):
+        first = await resolver.resolve_mx_and_a('example.test')
+        second = await resolver.resolve_mx_and_a('example.test')
+        return first, second, server.queries
+
+    first, second, queries = asyncio.run(with_stub_server(test))
+    mx, a = second
+    assert [str(record.exchange) for record in mx] == ['mail.example.test.']
+    assert [record.address for record in a] == ['192.0.2.1']
+    assert [str(record.exchange) for record in first[0]] == ['mail.example.test.']
+    # The second lookup never reached the server
+    assert sorted(queries) == [('example.test.', 'A'), ('example.test.', 'MX')]
+
+def test_nxdomain_is_returned_not_raised():
+    async def test(resolver, server):
+        return await resolver.resolve_mx_and_a('missing.test')
+
+    mx, a = asyncio.run(with_stub_server(test))
+    assert isinstance(mx, dns.resolver.NXDOMAIN)
+    assert isinstance(a, dns.resolver.NXDOMAIN)
+
+def test_timeout_is_returned_not_raised():
+    async def test(resolver, server):
+        return await resolver.resolve_mx_and_a('slow.test')
+
+    mx, a = asyncio.run(with_stub_server(test))
+    assert isinstance(mx, dns.exception.Timeout)
+    assert isinstance(a, dns.exception.Timeout)
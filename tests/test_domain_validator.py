@@ -0,0 +1,79 @@
+import asyncio
+import functools
+import shutil
+import ssl
+import subprocess
+import time
+
+import pytest
+
+aiohttp = pytest.importorskip('aiohttp')
+pytest.importorskip('dns')
+from aiohttp import web
+
+import domain_validator
+from domain_validator import DomainValidator
+
+CERT_DAYS = 30
+
+@pytest.fixture
+def certificate(tmp_path):
+    """A self-signed certificate for localhost, valid for CERT_DAYS days"""
+    if shutil.which('openssl') is None:
+        pytest.skip('openssl is not installed')
+    cert, key = tmp_path / 'cert.pem', tmp_path / 'key.pem'
+    subprocess.run(
+        ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-keyout', str(key), '-out', str(cert),
+         '-days', str(CERT_DAYS), '-subj', '/CN=localhost', '-addext', 'subjectAltName=DNS:localhost'],
+        check=True, capture_output=True
+    )
+    return cert, key
+
+@pytest.fixture
+def validator_class(tmp_path, monkeypatch, certificate):
+    """DomainValidator, with HTTP sessions that trust the test certificate"""
+    monkeypatch.chdir(tmp_path)
+    client_context = ssl.create_default_context(cafile=str(certificate[0]))
+    monkeypatch.setattr(domain_validator.aiohttp, 'TCPConnector',
+                        functools.partial(aiohttp.TCPConnector, ssl=client_context))
+    return DomainValidator
+
+async def probe(validator_class, certificate, probe_mode):
+    server_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    server_context.load_cert_chain(str(certificate[0]), str(certificate[1]))
+
+    async def index(request):
+        return web.Response(text='<a href="mailto:info@localhost">info@localhost</a>')
+
+    app = web.Application()
+    app.router.add_get('/', index)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, 'localhost', 0, ssl_context=server_context)
+    await site.start()
+    port = runner.addresses[0][1]
+    try:
+        async with validator_class(probe_mode=probe_mode) as validator:
+            return await validator.probe_domain(f'localhost:{port}')
+    finally:
+        await runner.cleanup()
+
+@pytest.mark.parametrize('probe_mode', ['head', 'get'])
+def test_probe_records_certificate_expiry(validator_class, certificate, probe_mode):
+    status, cert_expiry = asyncio.run(probe(validator_class, certificate, probe_mode))
+    assert status == 200
+    assert cert_expiry is not None
+    assert abs(cert_expiry - (time.time() + CERT_DAYS * 86400)) < 86400
+
+def test_get_probe_reads_at_most_probe_max_bytes(validator_class, certificate, monkeypatch):
+    reads = []
+    original_read = aiohttp.StreamReader.read
+
+    async def read(self, n=-1):
+        reads.append(n)
+        return await original_read(self, n)
+
+    monkeypatch.setattr(aiohttp.StreamReader, 'read', read)
+    status, _ = asyncio.run(probe(functools.partial(validator_class, probe_max_bytes=16), certificate, 'get'))
+    assert status == 200
+    assert reads == [16]
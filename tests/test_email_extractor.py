@@ -0,0 +1,37 @@
+import random
+import time
+
+from email_extractor import MAX_PENDING_RUN, StreamingEmailExtractor, extract_emails
+
+def stream(text, sizes):
+    extractor = StreamingEmailExtractor()
+    position = 0
+    for size in sizes:
+        extractor.feed(text[position:position + size])
+        position += size
+    extractor.feed(text[position:])
+    return extractor.finish()
+
+def random_page(rng):
+    pieces = ['info@acme.com', 'Sales.Team@mail.example.co.uk', 'logo@2x.png', 'a@b', '@@', 'x@y.io',
+              '<a href="mailto:', '">', ' ', '\n', 'token=', 'aB3_-.%+' * rng.randint(0, 20)]
+    return ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 60)))
+
+def test_random_chunk_splits_match_extract_emails():
+    rng = random.Random(0)
+    for _ in range(2000):
+        text = random_page(rng)
+        sizes = [rng.randint(0, 12) for _ in range(rng.randint(0, 20))]
+        assert stream(text, sizes) == extract_emails(text), (text, sizes)
+
+def test_long_runs_are_scanned_in_linear_time():
+    # base64url blobs ending inside a chunk, longer than MAX_PENDING_RUN,
+    # with and without an '@' inside
+    blob = 'aB9_-' * 4_000
+    assert len(blob) > MAX_PENDING_RUN
+    for token in (blob, f'{blob}@{blob}'):
+        text = ''.join(f'<p data-x="{token}">' for _ in range(10)) + ' info@acme.com'
+        start = time.perf_counter()
+        found = stream(text, [64 * 1024] * (len(text) // (64 * 1024)))
+        assert time.perf_counter() - start < 0.5
+        assert found == extract_emails(text)
@@ -0,0 +1,31 @@
+from frontier import Frontier
+
+PATTERNS = ['yell.com', 'contact', 'about']
+
+def test_pop_orders_by_learned_yield():
+    frontier = Frontier(PATTERNS)
+    for url in ['https://a.com/blog', 'https://b.com/contact', 'https://www.yell.com/biz/1']:
+        assert frontier.push(url)
+    assert not frontier.push('https://a.com/blog')
+    first, _ = frontier.pop()
+    assert first in ('https://b.com/contact', 'https://www.yell.com/biz/1')
+    frontier.record(first, 0)
+    frontier.record(first, 0)
+    second, _ = frontier.pop()
+    assert second != first and second != 'https://a.com/blog'
+
+def test_discarded_and_recorded_urls_leave_no_state():
+    frontier = Frontier(PATTERNS)
+    for i in range(100):
+        frontier.push(f'https://site{i}.com/contact', i)
+    while True:
+        entry = frontier.pop()
+        if entry is None:
+            break
+        url, data = entry
+        if data % 2:
+            frontier.discard(url)
+        else:
+            frontier.record(url, 1)
+    assert frontier._in_flight == {}
+    assert frontier.fetches == 50
@@ -0,0 +1,43 @@
+import base64
+from urllib.parse import quote
+
+import pytest
+
+from parse_pool import extract_links
+from url_index import CanonicalURLIndex, canonicalize_url, unwrap_redirect
+
+def test_canonicalize_url_normalizes_equivalent_urls():
+    assert canonicalize_url('HTTPS://WWW.Example.com:443/Contact/?utm_source=x&b=2&a=1#team') == \
+        'https://www.example.com/Contact?a=1&b=2'
+    assert canonicalize_url('http://example.com') == 'http://example.com/'
+    assert canonicalize_url('http://example.com:8080/x/') == 'http://example.com:8080/x'
+
+@pytest.mark.parametrize('url', ['http://[bad/', 'http://example.com:99999/', 'https://example.com:port/'])
+def test_canonicalize_url_rejects_malformed_urls(url):
+    with pytest.raises(ValueError):
+        canonicalize_url(url)
+
+def test_unwrap_redirect_resolves_search_engine_links():
+    target = 'https://acme.com/contact'
+    assert unwrap_redirect(f'https://www.google.com/url?q={quote(target)}&sa=U') == target
+    assert unwrap_redirect(f'//duckduckgo.com/l/?uddg={quote(target)}') == target
+    assert unwrap_redirect(f'https://r.search.yahoo.com/_ylt=x/RU={quote(target, safe="")}/RK=2/RS=y') == target
+    encoded = base64.urlsafe_b64encode(target.encode()).decode().rstrip('=')
+    assert unwrap_redirect(f'https://www.bing.com/ck/a?u=a1{encoded}&ntb=1') == target
+    assert unwrap_redirect('https://www.google.com/url?q=javascript:alert(1)').startswith('https://www.google.com/')
+
+@pytest.mark.parametrize('url', ['http://[bad/', 'https://www.google.com/url?q=x', 'mailto:info@acme.com'])
+def test_unwrap_redirect_returns_other_urls_unchanged(url):
+    assert unwrap_redirect(url) == url
+
+def test_index_counts_duplicate_claims():
+    index = CanonicalURLIndex()
+    assert index.claim('https://acme.com/contact/')
+    assert not index.claim('https://ACME.com/contact?utm_source=bing')
+    assert 'https://acme.com/contact#form' in index
+    assert (index.claimed, index.saved) == (1, 1)
+
+def test_extract_links_skips_malformed_hrefs():
+    html = ('<a href="http://[bad/">a</a><a href="http://acme.com:99999/">b</a>'
+            '<a href="https://acme.com/contact">c</a><a href="/relative">d</a>')
+    assert extract_links(html, 'htmlparser') == ['https://acme.com/contact']
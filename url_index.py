@@ -0,0 +1,113 @@
+import base64
+from seen_sets import memory_bytes
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode, unquote
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    'gclid', 'dclid', 'fbclid', 'msclkid', 'yclid', 'igshid', 'mc_cid', 'mc_eid',
+    '_ga', '_gl', '_hsenc', '_hsmi', 'ref', 'ref_src', 'referrer', 'source', 'spm',
+    'trk', 'trkid', 'cmpid', 'srsltid'
+}
+TRACKING_PREFIXES = ('utm_', 'pk_', 'mtm_', 'hsa_')
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+def _unwrap_bing(value: str):
+    # Bing encodes the target as "a1" + urlsafe base64 without padding
+    if not value.startswith('a1'):
+        return None
+    encoded = value[2:]
+    try:
+        return base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4)).decode('utf-8')
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+def unwrap_redirect(url: str) -> str:
+    """Return the destination of a search engine click-tracking link, or url itself"""
+    if url.startswith('//'):
+        url = 'https:' + url
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        # Malformed, e.g. an unclosed IPv6 bracket; it cannot be a redirect
+        return url
+    host = (parts.hostname or '').lower()
+    params = dict(parse_qsl(parts.query))
+
+    target = None
+    if host.startswith('www.google.') and parts.path == '/url':
+        target = params.get('q') or params.get('url')
+    elif host.endswith('duckduckgo.com') and parts.path.startswith('/l/'):
+        target = params.get('uddg')
+    elif host == 'r.search.yahoo.com' and '/RU=' in parts.path:
+        target = unquote(parts.path.split('/RU=', 1)[1].split('/', 1)[0])
+    elif host.endswith('bing.com') and parts.path == '/ck/a':
+        target = _unwrap_bing(params.get('u', ''))
+
+    if target and target.startswith(('http://', 'https://')):
+        return target
+    return url
+
+def canonicalize_url(url: str) -> str:
+    """Canonical form used to decide whether two URLs are the same page.
+
+    Unwraps search engine redirects, lowercases scheme and host, drops
+    default ports, fragments and tracking parameters, sorts the remaining
+    query and strips trailing slashes from the path. Raises ValueError for
+    malformed URLs such as "http://[bad/" or an out-of-range port.
+    """
+    parts = urlsplit(unwrap_redirect(url.strip()))
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower().rstrip('.')
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path.rstrip('/') or '/'
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
+
+class CanonicalURLIndex:
+    """Run-wide index of canonical URLs already fetched or scheduled.
+
+    `seen` may be any set-like object with add() and `in`, such as a
+    seen_sets.ScalableBloomFilter for very large crawls.
+    """
+
+    def __init__(self, seen=None):
+        self._seen = set() if seen is None else seen
+        self.claimed = 0
+        self.saved = 0
+
+    def __contains__(self, url: str) -> bool:
+        return canonicalize_url(url) in self._seen
+
+    def __len__(self):
+        return len(self._seen)
+
+    def claim(self, url: str) -> bool:
+        """Reserve url for fetching; False means an equivalent URL was already claimed"""
+        canonical = canonicalize_url(url)
+        if canonical in self._seen:
+            self.saved += 1
+            return False
+        self._seen.add(canonical)
+        self.claimed += 1
+        return True
+
+    def note_duplicate(self):
+        """Count a fetch avoided before claim(), e.g. a link that was already queued"""
+        self.saved += 1
+
+    def record_redirect(self, url: str, final_url: str):
+        """Remember where url redirected to so links to the target are skipped"""
+        if final_url and final_url != url:
+            self._seen.add(canonicalize_url(final_url))
+
+    def memory_bytes(self) -> int:
+        return memory_bytes(self._seen)
+
+    def summary(self) -> str:
+        return f"{self.claimed} URLs fetched, {self.saved} duplicate fetches saved"
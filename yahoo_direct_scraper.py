@@ -1,21 +1,18 @@
 import asyncio
-from playwright.async_api import async_playwright
-import re
-from datetime import datetime
 import random
 import logging
 import json
 from bs4 import BeautifulSoup
 import urllib.parse
 import time
-import os
+from email_extractor import extract_emails_from_playwright_page
+from navigation_policy import NavigationPolicy
+from scraper_base import BrowserScraper, run_scraper
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-EMAIL_REGEX = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
-
 # Direct site URLs with proper formatting
 DIRECT_SITES = {
     "yellowpages": "https://www.yellowpages.com/search?search_terms={}",
@@ -24,24 +21,54 @@ DIRECT_SITES = {
     "facebook": "https://www.facebook.com/pages/search/top?q={}"
 }
 
-async def extract_emails_from_page(page):
+async def extract_emails_from_page(page, mode='dom'):
     try:
-        content = await page.content()
-        emails = set()
-        found_emails = re.findall(EMAIL_REGEX, content)
+        emails = await extract_emails_from_playwright_page(page, mode)
         
-        for email in found_emails:
-            email = email.lower()
-            if not email.endswith(('.png', '.jpg', '.jpeg', '.svg', '.gif', '.webp')):
-                emails.add(email)
-                logger.info(f"Found email: {email}")
+        for email in emails:
+            logger.info(f"Found email: {email}")
         
         return emails
     except Exception as e:
         logger.error(f"Error extracting emails: {str(e)}")
         return set()
 
-async def process_yahoo_search(page, query, page_num):
+async def visit_links(page, links, navigation_policy, tab_pool=None, robots=None, limit=20, on_page=None):
+    """Visit result links and return their emails, concurrently when a tab pool is given.
+
+    on_page(link, emails) is awaited as soon as each link has been visited.
+    """
+    if robots is not None:
+        # Drop disallowed links before they take one of the visit slots
+        links = await robots.filter_allowed(links)
+    links = links[:limit]
+    
+    async def visit(tab, link):
+        emails = await navigation_policy.visit(tab, link, extract_emails_from_page)
+        if on_page is not None:
+            await on_page(link, emails)
+        return emails
+
+    emails = set()
+    if tab_pool is None:
+        results = []
+        for link in links:
+            try:
+                results.append(await visit(page, link))
+            except Exception as e:
+                results.append(e)
+    else:
+        results = await tab_pool.map(links, visit)
+    
+    for link, result in zip(links, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error processing link {link}: {str(result)}")
+        else:
+            emails.update(result)
+    return emails
+
+async def process_yahoo_search(page, query, page_num, navigation_policy=None, tab_pool=None, robots=None, on_page=None):
+    navigation_policy = navigation_policy or NavigationPolicy()
     try:
         encoded_query = urllib.parse.quote(query)
         url = f"https://search.yahoo.com/search?p={encoded_query}&b={page_num * 10}"
@@ -62,29 +89,23 @@ async def process_yahoo_search(page, query, page_num):
         logger.info(f"Found {len(links)} links on Yahoo page {page_num + 1}")
         
         # Process links
-        emails = set()
-        for link in links[:20]:  # Limit to 20 links per page
-            try:
-                await page.goto(link, wait_until="networkidle")
-                await page.wait_for_timeout(random.randint(2000, 4000))
-                page_emails = await extract_emails_from_page(page)
-                emails.update(page_emails)
-            except Exception as e:
-                logger.error(f"Error processing link {link}: {str(e)}")
-                continue
-        
-        return emails
+        return await visit_links(page, links, navigation_policy, tab_pool, robots, on_page=on_page)  # Limit to 20 links per page
     
     except Exception as e:
         logger.error(f"Error processing Yahoo search results: {str(e)}")
         return set()
 
-async def process_direct_site(page, site_name, query):
+async def process_direct_site(page, site_name, query, navigation_policy=None, tab_pool=None, robots=None, on_page=None):
+    navigation_policy = navigation_policy or NavigationPolicy()
     try:
         encoded_query = urllib.parse.quote(query)
         url = DIRECT_SITES[site_name].format(encoded_query)
         logger.info(f"Processing {site_name}")
         
+        if robots is not None and not await robots.allowed(url):
+            logger.info(f"Skipping {site_name}: listing disallowed by robots.txt")
+            return set()
+        
         await page.goto(url, wait_until="networkidle")
         await page.wait_for_timeout(random.randint(2000, 4000))
         
@@ -119,140 +140,55 @@ async def process_direct_site(page, site_name, query):
         logger.info(f"Found {len(links)} links on {site_name}")
         
         # Process links
-        emails = set()
-        for link in links[:20]:  # Limit to 20 links per page
-            try:
-                await page.goto(link, wait_until="networkidle")
-                await page.wait_for_timeout(random.randint(2000, 4000))
-                page_emails = await extract_emails_from_page(page)
-                emails.update(page_emails)
-            except Exception as e:
-                logger.error(f"Error processing link {link}: {str(e)}")
-                continue
-        
-        return emails
+        return await visit_links(page, links, navigation_policy, tab_pool, robots, on_page=on_page)  # Limit to 20 links per page
     
     except Exception as e:
         logger.error(f"Error processing {site_name}: {str(e)}")
         return set()
 
-class YahooDirectScraper:
-    def __init__(self):
-        self.results = set()
-        self.max_pages = 3
-        self.max_retries = 3
-        self.delay_range = (2, 4)  # seconds between requests
-        
-        # Ensure output directory exists
-        self.output_dir = "pre-validated_lists"
-        os.makedirs(self.output_dir, exist_ok=True)
-        
-    async def init_browser(self):
-        async with async_playwright() as p:
-            # Launch browser with realistic settings
-            self.browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-features=IsolateOrigins,site-per-process',
-                    '--disable-site-isolation-trials'
-                ]
+class YahooDirectScraper(BrowserScraper):
+    engine = 'yahoo'
+    source = 'yahoo_direct'
+
+    async def prepare_page(self):
+        """Add cookies to the search tab's context"""
+        # Add cookies for more realistic behavior
+        await self.context.add_cookies([
+            {
+                'name': 'CONSENT',
+                'value': 'YES+cb',
+                'domain': '.google.com',
+                'path': '/'
+            },
+            {
+                'name': 'NID',
+                'value': str(random.randint(1000000000, 9999999999)),
+                'domain': '.google.com',
+                'path': '/'
+            }
+        ])
+
+    async def scrape_pages(self, query: str):
+        """Process Yahoo search results, then the business directories"""
+        for i in range(self.max_pages):
+            await process_yahoo_search(
+                self.page, query, i, self.navigation_policy, self.tab_pool, self.browser_pool.robots,
+                lambda link, emails: self.record_emails(link, emails, 'yahoo')
             )
-            
-            # Create a new context with realistic browser settings
-            self.context = await self.browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
-                locale='en-US',
-                timezone_id='America/New_York',
-                geolocation={'latitude': 40.7128, 'longitude': -74.0060},
-                permissions=['geolocation'],
-                extra_http_headers={
-                    'Accept-Language': 'en-US,en;q=0.9',
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                    'Accept-Encoding': 'gzip, deflate, br',
-                    'Connection': 'keep-alive',
-                    'Upgrade-Insecure-Requests': '1',
-                    'Sec-Fetch-Dest': 'document',
-                    'Sec-Fetch-Mode': 'navigate',
-                    'Sec-Fetch-Site': 'none',
-                    'Sec-Fetch-User': '?1',
-                    'DNT': '1'
-                }
+            logger.info(f"Found {len(self.results)} unique emails so far...")
+            await asyncio.sleep(random.uniform(*self.delay_range))
+        
+        # Process direct sites
+        for site_name in DIRECT_SITES:
+            await process_direct_site(
+                self.page, site_name, query, self.navigation_policy, self.tab_pool, self.browser_pool.robots,
+                lambda link, emails: self.record_emails(link, emails, site_name)
             )
-            
-            # Create a new page
-            self.page = await self.context.new_page()
-            
-            # Add cookies for more realistic behavior
-            await self.context.add_cookies([
-                {
-                    'name': 'CONSENT',
-                    'value': 'YES+cb',
-                    'domain': '.google.com',
-                    'path': '/'
-                },
-                {
-                    'name': 'NID',
-                    'value': str(random.randint(1000000000, 9999999999)),
-                    'domain': '.google.com',
-                    'path': '/'
-                }
-            ])
-
-    async def scrape_emails(self, query: str):
-        """Main scraping function"""
-        logger.info(f"Starting email scraping for query: {query}")
-        
-        try:
-            await self.init_browser()
-            
-            # Process Yahoo search
-            for i in range(self.max_pages):
-                page_emails = await process_yahoo_search(self.page, query, i)
-                self.results.update(page_emails)
-                logger.info(f"Found {len(self.results)} unique emails so far...")
-                await asyncio.sleep(random.uniform(*self.delay_range))
-            
-            # Process direct sites
-            for site_name in DIRECT_SITES:
-                site_emails = await process_direct_site(self.page, site_name, query)
-                self.results.update(site_emails)
-                logger.info(f"Found {len(self.results)} unique emails so far...")
-                await asyncio.sleep(random.uniform(*self.delay_range))
-            
-            # Save results
-            if self.results:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = os.path.join(self.output_dir, f"emails_yahoo_direct_{timestamp}.txt")
-                with open(filename, "w", encoding="utf-8") as f:
-                    f.write(f"Email Scraping Results (Yahoo & Direct Sites)\n")
-                    f.write(f"Query: {query}\n")
-                    f.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                    f.write(f"Total Emails Found: {len(self.results)}\n")
-                    f.write("=" * 50 + "\n\n")
-                    
-                    for email in sorted(self.results):
-                        f.write(f"Email: {email}\n")
-                        f.write("-" * 30 + "\n")
-                
-                logger.info(f"Emails saved to {filename}")
-            else:
-                logger.warning("No emails found. Try a different search query.")
-        
-        except Exception as e:
-            logger.error(f"Error during scraping: {str(e)}")
-        
-        finally:
-            if hasattr(self, 'browser'):
-                await self.browser.close()
-            if hasattr(self, 'playwright'):
-                await self.playwright.stop()
+            logger.info(f"Found {len(self.results)} unique emails so far...")
+            await asyncio.sleep(random.uniform(*self.delay_range))
 
 async def main():
-    query = input("Enter your search query (e.g. dentists in Dubai): ")
-    scraper = YahooDirectScraper()
-    await scraper.scrape_emails(query)
+    await run_scraper(YahooDirectScraper)
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file